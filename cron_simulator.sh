@@ -2,6 +2,8 @@
 # Cron replacement for container environments
 # Run this script in background to simulate cron behavior
 
+PROJECT_ROOT="$(cd "$(dirname "$0")" && pwd)"
+
 while true; do
     current_minute=$(date +%M)
     current_hour=$(date +%H)
@@ -10,7 +12,7 @@ while true; do
     hour_no_zero=$(echo $current_hour | sed 's/^0*//')  # Remove leading zeros
     if [ $hour_no_zero -ge 8 ] && [ $hour_no_zero -le 23 ] && [ $(($current_minute % 2)) -eq 0 ]; then
         echo "$(date): Running scheduled task"
-        /workspaces/kiotviet-integration/scripts/run_all_cron.sh
+        python "$PROJECT_ROOT/scripts/kiotviet_run_all.py"
         # Wait 60 seconds to avoid duplicate runs
         sleep 60
     fi
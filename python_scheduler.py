@@ -4,20 +4,24 @@ Python-based scheduler using APScheduler
 Alternative to cron for container environments
 """
 
+import os
 import sys
-import time
 from pathlib import Path
 
 # Add project root to path
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = Path(__file__).resolve().parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
-import subprocess
+from apscheduler.triggers.interval import IntervalTrigger
 import logging
 
+from src.api.exceptions import ConfigurationError, KiotVietAPIError
+from src.services import get_invoice_service, get_product_service
+from src.utils.azure_blob import upload_to_azure_blob
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -25,29 +29,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Services are built once so every tick reuses the loaded config and the
+# client's HTTP session instead of paying for a fresh interpreter per run.
+_invoice = get_invoice_service()
+_product = get_product_service()
+
+
+def _upload(label: str, output_file: Path) -> None:
+    try:
+        blob_url = upload_to_azure_blob(output_file)
+        logger.info(f"{label} data uploaded to Azure: {blob_url}")
+    except Exception as e:
+        logger.error(f"Failed to upload {label.lower()} data to Azure: {e}")
+
+
 def run_sync_job():
     """Run the sync job"""
     try:
         logger.info("Starting scheduled sync job")
-        result = subprocess.run(
-            ["/workspaces/kiotviet-integration/scripts/run_all_cron.sh"],
-            capture_output=True,
-            text=True,
-            timeout=300  # 5 minute timeout
+
+        invoice_result = _invoice.sync(incremental=True)
+        logger.info(
+            f"Invoice sync completed: invoices={invoice_result.invoices}"
+            f" lines={invoice_result.lines}"
+            f" duration={invoice_result.duration_seconds:.1f}s"
         )
+        _upload("Invoice", invoice_result.output_file)
 
-        if result.returncode == 0:
-            logger.info("Sync job completed successfully")
-        else:
-            logger.error(f"Sync job failed with return code {result.returncode}")
-            if result.stderr:
-                logger.error(f"Error output: {result.stderr}")
+        product_result = _product.export()
+        logger.info(
+            f"Product export completed: products={product_result.products}"
+            f" duration={product_result.duration_seconds:.1f}s"
+        )
+        _upload("Product", product_result.output_file)
 
-    except subprocess.TimeoutExpired:
-        logger.error("Sync job timed out after 5 minutes")
+        logger.info("Sync job completed successfully")
+
+    except (ConfigurationError, KiotVietAPIError) as e:
+        logger.error(f"Sync job failed: {e}")
     except Exception as e:
         logger.error(f"Error running sync job: {e}")
 
+def build_trigger(interval_minutes: int, hours: str):
+    """Fire every interval_minutes, optionally only within the given UTC hours"""
+    if interval_minutes < 1:
+        raise ConfigurationError(
+            f"SCHEDULER_INTERVAL_MINUTES must be at least 1, got {interval_minutes}"
+        )
+    if not hours:
+        # Fixed cadence around the clock needs no cron expression at all
+        return IntervalTrigger(minutes=interval_minutes, timezone='UTC')
+    if interval_minutes >= 60:
+        # minute='*/N' only steps within an hour: */60 and */90 both fire at :00
+        raise ConfigurationError(
+            "SCHEDULER_INTERVAL_MINUTES must be below 60 when SCHEDULER_HOURS is set,"
+            f" got {interval_minutes}"
+        )
+    return CronTrigger(
+        hour=hours,
+        minute=f'*/{interval_minutes}',
+        timezone='UTC'
+    )
+
 def main():
     """Main scheduler function"""
     logger.info("Starting Python scheduler (APScheduler)")
@@ -55,11 +98,11 @@ def main():
     # Create scheduler
     scheduler = BlockingScheduler()
 
-    # Schedule job to run every 2 minutes
-    trigger = CronTrigger(
-        minute='*/2',  # Every 2 minutes
-        timezone='UTC'
-    )
+    # Every 2 minutes from 8 AM to 11 PM UTC unless overridden;
+    # SCHEDULER_HOURS="" runs around the clock
+    interval_minutes = int(os.getenv('SCHEDULER_INTERVAL_MINUTES', '2'))
+    hours = os.getenv('SCHEDULER_HOURS', '8-23')
+    trigger = build_trigger(interval_minutes, hours)
 
     scheduler.add_job(
         run_sync_job,
@@ -67,10 +110,13 @@ def main():
         id='kiotviet_sync',
         name='KiotViet Data Sync',
         max_instances=1,  # Only one instance at a time
+        coalesce=True,  # Collapse a backlog of missed ticks into one run
+        misfire_grace_time=300,  # Still run a tick that starts late
         replace_existing=True
     )
 
-    logger.info("Scheduler started. Jobs will run every 2 minutes from 8 AM to 11 PM UTC")
+    window = f"during hours {hours} UTC" if hours else "around the clock"
+    logger.info(f"Scheduler started. Jobs will run every {interval_minutes} minutes {window}")
     logger.info("Press Ctrl+C to stop the scheduler")
 
     try:
@@ -84,4 +130,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,15 +2,20 @@
 
 """Retrieve KiotViet access token via Selenium Wire."""
 
+import atexit
+import fcntl
+import functools
 import os
 import sys
-import time
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import IO, Optional, Tuple
+from urllib.parse import urlsplit
 
 from seleniumwire import webdriver  # type: ignore
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
@@ -26,6 +31,15 @@ from src.services import TokenService
 from src.utils.config import config
 
 LOGIN_URL = "https://248minimart.kiotviet.vn/man/#/login"
+LOGIN_ORIGIN = "{0.scheme}://{0.netloc}".format(urlsplit(LOGIN_URL))
+# A stable profile on tmpfs lets Chromium reuse its code and HTTP caches
+CHROME_PROFILE_DIR = os.environ.get(
+    "KIOTVIET_CHROME_PROFILE", "/dev/shm/kiotviet-chrome-profile"
+)
+
+_driver: Optional[webdriver.Chrome] = None
+_driver_lock = threading.Lock()
+_profile_lock: Optional[IO[str]] = None
 
 
 def _require_env(name: str) -> str:
@@ -50,23 +64,77 @@ def _resolve_token_path() -> Path:
     return path
 
 
-def _extract_token(
-    driver: webdriver.Chrome,
-) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
-    for request in driver.requests:
-        if request.response is None:
-            continue
+class _TokenCapture:
+    """Request interceptor that keeps the first Bearer token the app sends."""
+
+    def __init__(self) -> None:
+        self._found = threading.Event()
+        self._value: Optional[Tuple[str, Optional[str], Optional[str]]] = None
+
+    def reset(self) -> None:
+        self._value = None
+        self._found.clear()
+
+    def __call__(self, request) -> None:
+        if self._found.is_set():
+            return
         auth_header = request.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            continue
+            return
         token = auth_header.replace("Bearer ", "", 1)
         retailer = request.headers.get("Retailer")
         branch = request.headers.get("BranchId")
-        return token, retailer, branch
-    return None
+        self._value = (token, retailer, branch)
+        self._found.set()
 
+    def wait(
+        self, timeout: float
+    ) -> Optional[Tuple[str, Optional[str], Optional[str]]]:
+        if not self._found.wait(timeout):
+            return None
+        return self._value
 
-def login_and_extract_token() -> None:
+
+_token_capture = _TokenCapture()
+
+
+def _lock_profile(profile_dir: Path) -> IO[str]:
+    """Hold an exclusive lock so two processes never share one profile."""
+    handle = open(profile_dir / ".kiotviet.lock", "w")
+    try:
+        fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError as exc:
+        handle.close()
+        raise RuntimeError(
+            f"Chrome profile {profile_dir} is in use by another process"
+        ) from exc
+    return handle
+
+
+def _release_profile() -> None:
+    global _profile_lock
+    if _profile_lock is not None:
+        _profile_lock.close()
+        _profile_lock = None
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_chromedriver() -> str:
+    """Locate chromedriver once per process."""
+    # Try system chromedriver first, fallback to webdriver-manager
+    chromedriver_path = "/usr/lib/bin/chromedriver"  # Common system path
+    if not os.path.exists(chromedriver_path):
+        chromedriver_path = "/usr/lib/chromium-browser/chromedriver"  # Alternative path
+    if not os.path.exists(chromedriver_path):
+        # Fallback to webdriver-manager for ARM; keep the downloaded driver
+        # in the project's .wdm/ so it survives between runs
+        os.environ.setdefault("WDM_LOCAL", "1")
+        chromedriver_path = ChromeDriverManager().install()
+    return chromedriver_path
+
+
+def _build_driver() -> webdriver.Chrome:
+    global _profile_lock
     options = Options()
     options.add_argument("--start-maximized")
     options.add_argument("--disable-blink-features=AutomationControlled")
@@ -75,25 +143,77 @@ def login_and_extract_token() -> None:
     options.add_argument("--disable-gpu")
     options.add_argument("--remote-debugging-port=0")
     options.add_argument("--headless")  # Run in headless mode
-    user_data_dir = f"/tmp/chrome_user_data_{os.getpid()}_{int(time.time())}"
-    options.add_argument(f"--user-data-dir={user_data_dir}")
+    profile_dir = Path(CHROME_PROFILE_DIR)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    options.add_argument(f"--user-data-dir={profile_dir}")
 
     options.binary_location = "/usr/bin/chromium-browser"
-    # Try system chromedriver first, fallback to webdriver-manager
-    chromedriver_path = "/usr/lib/bin/chromedriver"  # Common system path
-    if not os.path.exists(chromedriver_path):
-        chromedriver_path = "/usr/lib/chromium-browser/chromedriver"  # Alternative path
-    if not os.path.exists(chromedriver_path):
-        # Fallback to webdriver-manager for ARM
-        from webdriver_manager.chrome import ChromeDriverManager
-        chromedriver_path = ChromeDriverManager().install()
-    
-    service = Service(chromedriver_path)
+    service = Service(_resolve_chromedriver())
+    _profile_lock = _lock_profile(profile_dir)
+    try:
+        driver = webdriver.Chrome(
+            service=service,
+            options=options,
+            seleniumwire_options={
+                "disable_capture": False,
+                "request_storage": "memory",
+                "request_storage_max_size": 50,
+            },
+        )
+    except Exception:
+        _release_profile()
+        raise
+    driver.scopes = [r".*kiotviet\.vn/.*"]
+    driver.request_interceptor = _token_capture
+    return driver
+
+
+def _get_driver() -> webdriver.Chrome:
+    """Return the shared headless driver, launching Chromium on first use."""
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            _driver = _build_driver()
+        return _driver
+
+
+def _shutdown_driver() -> None:
+    global _driver
+    with _driver_lock:
+        if _driver is None:
+            return
+        try:
+            _driver.quit()
+        finally:
+            _driver = None
+            _release_profile()
+
+
+atexit.register(_shutdown_driver)
 
-    driver = webdriver.Chrome(service=service, options=options)
+
+def _reset_session(driver: webdriver.Chrome) -> None:
+    """Log the reused browser out so the next login issues fresh API calls."""
+    # Through CDP rather than page scripts: cookies and localStorage persist
+    # in the profile, and a freshly launched driver still on data:, has no
+    # KiotViet page to clear them from
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    driver.execute_cdp_cmd(
+        "Storage.clearDataForOrigin",
+        {"origin": LOGIN_ORIGIN, "storageTypes": "local_storage"},
+    )
+    if driver.current_url.startswith("http"):
+        # sessionStorage belongs to the tab, so only a loaded page has any
+        driver.execute_script("window.sessionStorage.clear();")
+    del driver.requests
+
+
+def login_and_extract_token() -> None:
+    driver = _get_driver()
     wait = WebDriverWait(driver, 30)
 
     try:
+        _reset_session(driver)
         print("Opening KiotViet login page...")
         driver.get(LOGIN_URL)
 
@@ -115,13 +235,15 @@ def login_and_extract_token() -> None:
                 (By.XPATH, "//span[text()='Quản lý']/ancestor::button")
             )
         )
+        # Reset only now: until the click, the previous SPA can still fire
+        # requests carrying its old token
+        _token_capture.reset()
         login_button.click()
         print("Submitted login form, waiting for dashboard...")
 
         wait.until(lambda d: "/DashBoard" in d.current_url)
-        time.sleep(5)
 
-        token_info = _extract_token(driver)
+        token_info = _token_capture.wait(timeout=10)
         if not token_info:
             raise RuntimeError(
                 "Could not find Authorization header in network requests."
@@ -154,9 +276,17 @@ def login_and_extract_token() -> None:
             f"Retailer ID: {credentials.retailer_id} | Branch ID: {credentials.branch_id}"
         )
 
+    except WebDriverException:
+        # A broken browser session must not be handed to the next caller
+        _shutdown_driver()
+        raise
     finally:
-        input("Press Enter to close the browser...")
-        driver.quit()
+        # Only pause for a human; scheduled runs have no terminal and would
+        # block forever on EOF. The browser stays open for the next login.
+        if sys.stdin.isatty():
+            input("Press Enter to continue...")
+        if _driver is not None:
+            del _driver.requests
 
 
 if __name__ == "__main__":
@@ -11,7 +11,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.api.exceptions import ConfigurationError, KiotVietAPIError
-from src.services import InvoiceService
+from src.services import get_invoice_service
 from src.utils.logger import logger
 
 
@@ -29,7 +29,7 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    service = InvoiceService()
+    service = get_invoice_service()
 
     try:
         result = service.sync(incremental=not args.full)
@@ -11,7 +11,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.api.exceptions import ConfigurationError, KiotVietAPIError
-from src.services import ProductService
+from src.services import get_product_service
 from src.utils.logger import logger
 
 
@@ -34,7 +34,7 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     args = parse_args()
-    service = ProductService()
+    service = get_product_service()
 
     try:
         result = service.export(
@@ -3,6 +3,8 @@
 """Run invoice sync and product export in one go."""
 
 import argparse
+import asyncio
+import functools
 import sys
 from pathlib import Path
 from typing import Optional
@@ -12,14 +14,15 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.api.exceptions import ConfigurationError, KiotVietAPIError
-from src.services import InvoiceService, ProductService
+from src.services import get_invoice_service, get_product_service
+from src.utils.config import config
 from src.utils.logger import logger
 from src.utils.azure_blob import upload_to_azure_blob
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Run invoice synchronization and product export sequentially.",
+        description="Run invoice synchronization and product export concurrently.",
     )
     parser.add_argument(
         "--full-invoice",
@@ -46,12 +49,35 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip product export.",
     )
+    parser.add_argument(
+        "--upload",
+        action=argparse.BooleanOptionalAction,
+        default=bool(config.get("azure", {}).get("upload", True)),
+        help="Upload outputs to Azure Blob Storage (default from config).",
+    )
     return parser.parse_args()
 
 
-def run_invoice(full: bool) -> None:
-    service = InvoiceService()
-    result = service.sync(incremental=not full)
+def _report_upload(label: str, task: asyncio.Task[str]) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Failed to upload %s data to Azure: %s", label.lower(), exc)
+        print(f"Warning: Failed to upload {label.lower()} data to Azure: {exc}")
+        return
+    print(f"{label} data uploaded to Azure: {task.result()}")
+
+
+def _start_upload(label: str, output_file: Path) -> asyncio.Task[str]:
+    task = asyncio.create_task(asyncio.to_thread(upload_to_azure_blob, output_file))
+    task.add_done_callback(functools.partial(_report_upload, label))
+    return task
+
+
+async def run_invoice(full: bool, upload: bool) -> Optional[asyncio.Task[str]]:
+    service = get_invoice_service()
+    result = await asyncio.to_thread(service.sync, incremental=not full)
 
     print(
         "Invoice sync completed:"
@@ -66,18 +92,19 @@ def run_invoice(full: bool) -> None:
         "Checkpoint updated" if result.checkpoint_updated else "Checkpoint unchanged"
     )
 
-    # Upload to Azure Blob Storage
-    try:
-        blob_url = upload_to_azure_blob(result.output_file)
-        print(f"Invoice data uploaded to Azure: {blob_url}")
-    except Exception as e:
-        logger.error("Failed to upload invoice data to Azure: %s", e)
-        print(f"Warning: Failed to upload invoice data to Azure: {e}")
+    if not upload:
+        return None
+    # Upload to Azure Blob Storage in the background
+    return _start_upload("Invoice", result.output_file)
 
 
-def run_product(page_size: Optional[int], output: Optional[Path]) -> None:
-    service = ProductService()
-    result = service.export(page_size=page_size, output_file=output)
+async def run_product(
+    page_size: Optional[int], output: Optional[Path], upload: bool
+) -> Optional[asyncio.Task[str]]:
+    service = get_product_service()
+    result = await asyncio.to_thread(
+        service.export, page_size=page_size, output_file=output
+    )
 
     print(
         "Product export completed:"
@@ -86,13 +113,47 @@ def run_product(page_size: Optional[int], output: Optional[Path]) -> None:
         f" output={result.output_file}"
     )
 
-    # Upload to Azure Blob Storage
-    try:
-        blob_url = upload_to_azure_blob(result.output_file)
-        print(f"Product data uploaded to Azure: {blob_url}")
-    except Exception as e:
-        logger.error("Failed to upload product data to Azure: %s", e)
-        print(f"Warning: Failed to upload product data to Azure: {e}")
+    if not upload:
+        return None
+    # Upload to Azure Blob Storage in the background
+    return _start_upload("Product", result.output_file)
+
+
+async def _amain(args: argparse.Namespace) -> None:
+    # Invoice and product steps hit disjoint endpoints and write disjoint
+    # files, so run them side by side instead of one after the other.
+    tasks = []
+
+    if not args.skip_invoice:
+        logger.info("Starting invoice synchronization")
+        tasks.append(run_invoice(full=args.full_invoice, upload=args.upload))
+    else:
+        logger.info("Invoice sync skipped by flag")
+
+    if not args.skip_product:
+        logger.info("Starting product export")
+        tasks.append(
+            run_product(
+                page_size=args.product_page_size,
+                output=args.product_output,
+                upload=args.upload,
+            )
+        )
+    else:
+        logger.info("Product export skipped by flag")
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Uploads overlap with whichever step is still running; wait for them
+    # last. Their failures are reported by _report_upload, not raised.
+    uploads = [result for result in results if isinstance(result, asyncio.Task)]
+    await asyncio.gather(*uploads, return_exceptions=True)
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    for exc in failures[1:]:
+        logger.error("Run failed: %s", exc)
+    if failures:
+        raise failures[0]
 
 
 def main() -> None:
@@ -103,21 +164,7 @@ def main() -> None:
         return
 
     try:
-        if not args.skip_invoice:
-            logger.info("Starting invoice synchronization")
-            run_invoice(full=args.full_invoice)
-        else:
-            logger.info("Invoice sync skipped by flag")
-
-        if not args.skip_product:
-            logger.info("Starting product export")
-            run_product(
-                page_size=args.product_page_size,
-                output=args.product_output,
-            )
-        else:
-            logger.info("Product export skipped by flag")
-
+        asyncio.run(_amain(args))
     except (ConfigurationError, KiotVietAPIError, ValueError) as exc:
         logger.error("Run failed: %s", exc)
         sys.exit(1)
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-import json
+import random
 import time
-from typing import Any, Dict, Optional
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Union
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from src.api.exceptions import (
     AuthenticationError,
@@ -15,6 +19,18 @@ from src.api.exceptions import (
 )
 from src.utils.logger import logger
 
+URL_CACHE_SIZE = 256
+MAX_RETRY_DELAY = 30.0
+_ABSOLUTE_URL_PREFIXES = ("http://", "https://")
+# Query parameters as a dict, or a pre-encoded query string sent as-is
+Params = Union[Dict[str, Any], str]
+
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "User-Agent": "kiotviet-integration/1.0",
+}
+
 
 class KiotVietClient:
     """Simple HTTP client that wraps KiotViet API calls with retry logic."""
@@ -25,21 +41,44 @@ class KiotVietClient:
         timeout: int = 30,
         max_retries: int = 3,
         retry_delay: float = 0.5,
+        pool_maxsize: int = 32,
+        trust_env: bool = False,
         session: Optional[requests.Session] = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.session = session or requests.Session()
+        self.session = session or self._build_session(pool_maxsize, trust_env)
+        self._url_cache: Dict[str, str] = {}
+        # Error statuses with special handling; each returns True to retry
+        self._status_handlers: Dict[
+            int, Callable[[requests.Response, str, str, int], bool]
+        ] = {
+            401: self._on_auth_error,
+            429: self._on_rate_limit,
+        }
         self._logger = logger.getChild(self.__class__.__name__)
 
+    @staticmethod
+    def _build_session(pool_maxsize: int, trust_env: bool) -> requests.Session:
+        # The default adapter keeps only 10 connections per host, so callers
+        # fanning requests out over threads would keep re-handshaking.
+        session = requests.Session()
+        # With trust_env, every request re-reads proxy variables and ~/.netrc
+        session.trust_env = trust_env
+        session.headers.update(DEFAULT_HEADERS)
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def get(
         self,
         endpoint: str,
         *,
         headers: Dict[str, str],
-        params: Optional[Dict[str, Any]] = None,
+        params: Optional[Params] = None,
         timeout: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Perform a GET request and return the JSON payload."""
@@ -57,7 +96,7 @@ class KiotVietClient:
         *,
         headers: Dict[str, str],
         json_payload: Optional[Dict[str, Any]] = None,
-        params: Optional[Dict[str, Any]] = None,
+        params: Optional[Params] = None,
         timeout: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Perform a POST request and return the JSON payload."""
@@ -76,13 +115,14 @@ class KiotVietClient:
         endpoint: str,
         *,
         headers: Dict[str, str],
-        params: Optional[Dict[str, Any]] = None,
+        params: Optional[Params] = None,
         json_payload: Optional[Dict[str, Any]] = None,
         timeout: Optional[int] = None,
     ) -> Dict[str, Any]:
         url = self._build_url(endpoint)
         timeout_value = timeout or self.timeout
         last_error: Optional[Exception] = None
+        delay = self.retry_delay
 
         for attempt in range(self.max_retries + 1):
             try:
@@ -104,7 +144,7 @@ class KiotVietClient:
                     self.max_retries + 1,
                 )
                 if attempt < self.max_retries:
-                    self._sleep(attempt)
+                    delay = self._sleep(delay)
                     continue
                 raise KiotVietAPIError(
                     f"Request timeout after {timeout_value}s"
@@ -118,59 +158,124 @@ class KiotVietClient:
                     exc,
                 )
                 if attempt < self.max_retries:
-                    self._sleep(attempt)
+                    delay = self._sleep(delay)
                     continue
                 raise KiotVietAPIError("Request failed") from exc
 
-            if response.status_code == 401:
-                raise AuthenticationError("Authentication failed with status 401")
-
-            if response.status_code == 429:
-                self._logger.warning("Rate limit hit for %s %s", method, endpoint)
-                if attempt < self.max_retries:
-                    self._sleep(attempt)
+            status = response.status_code
+            if status >= 400:
+                handler = self._status_handlers.get(status)
+                if handler is not None and handler(response, method, endpoint, attempt):
+                    delay = self._sleep(delay, response)
                     continue
-                raise RateLimitError("Rate limit exceeded")
 
-            if 500 <= response.status_code < 600:
-                last_error = KiotVietAPIError(
-                    f"Server error {response.status_code}: {response.text}"
-                )
-                self._logger.warning(
-                    "Server error %s on %s %s",
-                    response.status_code,
-                    method,
-                    endpoint,
-                )
-                if attempt < self.max_retries:
-                    self._sleep(attempt)
-                    continue
-                raise last_error
+                if 500 <= status < 600:
+                    last_error = KiotVietAPIError(
+                        f"Server error {status}: {response.text}"
+                    )
+                    self._logger.warning(
+                        "Server error %s on %s %s",
+                        status,
+                        method,
+                        endpoint,
+                    )
+                    if attempt < self.max_retries:
+                        delay = self._sleep(delay, response)
+                        continue
+                    raise last_error
 
-            if not response.ok:
                 raise KiotVietAPIError(
-                    f"API request failed: {response.status_code} {response.text}"
+                    f"API request failed: {status} {response.text}"
                 )
 
+            # Known-empty bodies: skip buffering response.content entirely
+            if (
+                status in (204, 205)
+                or response.headers.get("Content-Length") == "0"
+            ):
+                response.close()
+                return {}
+
             if not response.content:
                 return {}
 
             try:
-                return response.json()
-            except json.JSONDecodeError as exc:
+                return orjson.loads(response.content)
+            except orjson.JSONDecodeError as exc:
                 raise KiotVietAPIError("Invalid JSON response") from exc
 
         raise KiotVietAPIError(
             f"API request failed after {self.max_retries + 1} attempts"
         ) from last_error
 
-    def _sleep(self, attempt: int) -> None:
-        delay = self.retry_delay * (2 ** attempt)
+    def _on_auth_error(
+        self,
+        response: requests.Response,
+        method: str,
+        endpoint: str,
+        attempt: int,
+    ) -> bool:
+        raise AuthenticationError("Authentication failed with status 401")
+
+    def _on_rate_limit(
+        self,
+        response: requests.Response,
+        method: str,
+        endpoint: str,
+        attempt: int,
+    ) -> bool:
+        self._logger.warning("Rate limit hit for %s %s", method, endpoint)
+        if attempt < self.max_retries:
+            return True
+        raise RateLimitError("Rate limit exceeded")
+
+    def _sleep(
+        self,
+        previous_delay: float,
+        response: Optional[requests.Response] = None,
+    ) -> float:
+        """Wait before the next attempt and return the delay used.
+
+        The server's Retry-After wins when present; otherwise use decorrelated
+        jitter so concurrent callers do not retry in lockstep.
+        """
+        delay = self._retry_after(response) if response is not None else None
+        if delay is None:
+            delay = random.uniform(self.retry_delay, previous_delay * 3)
+        delay = min(delay, MAX_RETRY_DELAY)
         time.sleep(delay)
+        return delay
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
 
     def _build_url(self, endpoint: str) -> str:
-        if endpoint.startswith("http://") or endpoint.startswith("https://"):
-            return endpoint
-        if not endpoint.startswith("/"):
-            endpoint = f"/{endpoint}"
-        return f"{self.base_url}{endpoint}"
+        # Paged calls hit the same endpoints over and over. Entries are only
+        # ever added, so a plain dict is safe to share between threads; it is
+        # capped because per-invoice detail URLs never repeat.
+        cached = self._url_cache.get(endpoint)
+        if cached is not None:
+            return cached
+        if endpoint.startswith(_ABSOLUTE_URL_PREFIXES):
+            url = endpoint
+        elif not endpoint.startswith("/"):
+            url = f"{self.base_url}/{endpoint}"
+        else:
+            url = f"{self.base_url}{endpoint}"
+        if len(self._url_cache) < URL_CACHE_SIZE:
+            self._url_cache[endpoint] = url
+        return url
@@ -5,7 +5,7 @@ from pathlib import Path
 import click
 
 from src.api.exceptions import ConfigurationError, KiotVietAPIError
-from src.services import ProductService
+from src.services import get_product_service
 
 
 @click.group(name="export")
@@ -35,7 +35,7 @@ def products(format: str, page_size: int, output: str) -> None:
     if format.lower() != "csv":
         raise click.ClickException("Only CSV export is supported at the moment.")
 
-    service = ProductService()
+    service = get_product_service()
     output_path = Path(output) if output else None
 
     try:
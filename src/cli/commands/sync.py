@@ -3,7 +3,7 @@
 import click
 
 from src.api.exceptions import ConfigurationError, KiotVietAPIError
-from src.services import InvoiceService
+from src.services import get_invoice_service
 
 
 @click.group(name="sync")
@@ -19,7 +19,7 @@ def sync_group() -> None:
 )
 def invoices(incremental: bool) -> None:
     """Sync invoice data."""
-    service = InvoiceService()
+    service = get_invoice_service()
     try:
         result = service.sync(incremental=incremental)
     except (ConfigurationError, KiotVietAPIError) as exc:
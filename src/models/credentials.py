@@ -1,8 +1,22 @@
 """Credential models"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Optional
 
+
+def _with_slots(cls):
+    """Rebuild a dataclass with ``__slots__`` (``slots=True`` needs 3.10+)"""
+    names = tuple(f.name for f in fields(cls))
+    body = {
+        key: value
+        for key, value in cls.__dict__.items()
+        if key not in names and key not in ("__dict__", "__weakref__")
+    }
+    body["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, body)
+
+
+@_with_slots
 @dataclass
 class AccessCredentials:
     """Container for API access credentials"""
@@ -4,3 +4,16 @@ from .base_service import BaseService
 from .invoice_service import InvoiceService, InvoiceSyncResult
 from .product_service import ProductService, ProductExportResult
 from .token_service import TokenService
+from ._factory import get_invoice_service, get_product_service, reset
+
+__all__ = [
+    "BaseService",
+    "InvoiceService",
+    "InvoiceSyncResult",
+    "ProductService",
+    "ProductExportResult",
+    "TokenService",
+    "get_invoice_service",
+    "get_product_service",
+    "reset",
+]
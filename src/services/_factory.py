@@ -0,0 +1,28 @@
+"""Process-wide service accessors."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+from src.services.base_service import shared_client
+from src.services.invoice_service import InvoiceService
+from src.services.product_service import ProductService
+
+
+@lru_cache(maxsize=1)
+def get_invoice_service() -> InvoiceService:
+    """Return the shared InvoiceService, building it on first use."""
+    return InvoiceService()
+
+
+@lru_cache(maxsize=1)
+def get_product_service() -> ProductService:
+    """Return the shared ProductService, building it on first use."""
+    return ProductService()
+
+
+def reset() -> None:
+    """Drop cached services and the shared client so the next call builds new ones."""
+    get_invoice_service.cache_clear()
+    get_product_service.cache_clear()
+    shared_client.cache_clear()
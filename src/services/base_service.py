@@ -3,14 +3,43 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import IO, Optional, Set
 
 from src.api.client import KiotVietClient
 from src.services.token_service import TokenService
 from src.utils.config import config
 from src.utils.logger import logger
 
+# CSV exports write many small rows; a large buffer turns them into few
+# big write() calls instead of one per 8 KiB.
+CSV_BUFFER_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=1)
+def shared_client(
+    base_url: str,
+    timeout: int,
+    max_retries: int,
+    pool_maxsize: int,
+    trust_env: bool,
+) -> KiotVietClient:
+    """Return the process-wide client for these settings.
+
+    Services built without an explicit client share it, so invoice and
+    product calls reuse one connection pool instead of each paying for
+    their own TLS handshakes.
+    """
+    return KiotVietClient(
+        base_url=base_url,
+        timeout=timeout,
+        max_retries=max_retries,
+        retry_delay=0.5,  # Default retry delay
+        pool_maxsize=pool_maxsize,
+        trust_env=trust_env,
+    )
+
 
 class BaseService:
     """Base class for KiotViet services with common initialization and utilities."""
@@ -29,13 +58,16 @@ class BaseService:
         base_url = api_cfg.get("base_url", "https://api-man1.kiotviet.vn/api")
         timeout = int(api_cfg.get("timeout", 30))
         max_retries = int(api_cfg.get("max_retries", 3))
+        max_connections = int(api_cfg.get("max_connections", 32))
+        trust_env = bool(api_cfg.get("trust_env", False))
 
         # Initialize API client
-        self.client = client or KiotVietClient(
-            base_url=base_url,
-            timeout=timeout,
-            max_retries=max_retries,
-            retry_delay=0.5,  # Default retry delay
+        self.client = client or shared_client(
+            base_url,
+            timeout,
+            max_retries,
+            max_connections,
+            trust_env,
         )
 
         # Initialize token service
@@ -46,25 +78,37 @@ class BaseService:
         self.output_dir = Path(data_cfg.get("output_dir", "data/output"))
         self.checkpoint_dir = Path(data_cfg.get("checkpoint_dir", "data/checkpoints"))
 
+        # Directories this instance has already created
+        self._created_dirs: Set[Path] = set()
+
         # Logger
         self._logger = logger.getChild(self.__class__.__name__)
 
     def get_credentials_and_headers(self):
         """Load credentials and build headers for API requests."""
-        credentials = self.token_service.load()
-        headers = TokenService.build_headers(credentials)
-        return credentials, headers
+        return self.token_service.load_with_headers()
+
+    def _open_csv(self, path: Path, mode: str = "w", encoding: str = "utf-8") -> IO[str]:
+        """Open a CSV file for writing with a large write buffer."""
+        return path.open(mode, newline="", encoding=encoding, buffering=CSV_BUFFER_SIZE)
+
+    def ensure_dir(self, directory: Path) -> None:
+        """Create directory (and parents) once per service instance."""
+        if directory in self._created_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        self._created_dirs.add(directory)
 
     def ensure_output_dir(self, path: Path) -> Path:
         """Ensure the output directory exists and return the full path."""
         if not path.is_absolute():
             path = self.output_dir / path
-        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ensure_dir(path.parent)
         return path
 
     def ensure_checkpoint_dir(self, path: Path) -> Path:
         """Ensure the checkpoint directory exists and return the full path."""
         if not path.is_absolute():
             path = self.checkpoint_dir / path
-        path.parent.mkdir(parents=True, exist_ok=True)
+        self.ensure_dir(path.parent)
         return path
\ No newline at end of file
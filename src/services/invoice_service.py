@@ -3,12 +3,32 @@
 from __future__ import annotations
 
 import csv
-import json
+import os
+import queue
+import re
+import threading
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
-
+from types import TracebackType
+from urllib.parse import urlencode
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+)
+
+import orjson
 from tqdm import tqdm
 
 from src.api.client import KiotVietClient
@@ -32,6 +52,166 @@ INVOICE_HEADERS = [
     "SubTotal",
 ]
 
+# Query strings never change, so encode them once rather than per request
+_LIST_QUERY = urlencode({"format": "json"})
+_DETAIL_QUERY = urlencode(
+    {
+        "format": "json",
+        "Includes": ["ProductName", "ProductCode", "SubTotal", "Product"],
+    },
+    doseq=True,
+)
+
+# Invoices between progress bar postfix updates
+PROGRESS_POSTFIX_EVERY = 32
+
+# Parsed PurchaseDate cached on each invoice dict by _filter_invoices
+PURCHASE_TS_KEY = "_purchase_ts"
+
+# KiotViet sends 7 fractional digits; fromisoformat wants at most 6 (exactly
+# 3 or 6 before Python 3.11)
+_FRACTION_RE = re.compile(r"\.(\d+)")
+
+
+def parse_purchase_date(value: Optional[str]) -> Optional[float]:
+    """Convert a PurchaseDate string to epoch seconds, or None if unparsable.
+
+    Naive timestamps are read as UTC so every value compares on one scale.
+    """
+    if not value:
+        return None
+    text = _FRACTION_RE.sub(
+        lambda match: "." + match.group(1)[:6].ljust(6, "0"),
+        value.replace("Z", "+00:00"),
+        count=1,
+    )
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _is_newer(
+    value: str,
+    value_ts: Optional[float],
+    reference: str,
+    reference_ts: Optional[float],
+) -> bool:
+    if value_ts is not None and reference_ts is not None:
+        if value_ts != reference_ts:
+            return value_ts > reference_ts
+        # Same microsecond: the 100 ns digit the parse dropped still orders
+        # them, or an invoice just after the checkpoint would be skipped
+        return _sub_microsecond_ns(value) > _sub_microsecond_ns(reference)
+    # Unrecognised format on either side: keep the old string ordering
+    return value > reference
+
+
+def _sub_microsecond_ns(value: str) -> int:
+    """Nanoseconds past the microsecond in value's fraction (0-999)."""
+    match = _FRACTION_RE.search(value)
+    if match is None:
+        return 0
+    return int(match.group(1)[6:9].ljust(3, "0"))
+
+
+class _BackgroundWriter:
+    """Hand row batches to a csv writer running on its own thread.
+
+    Keeps disk writes off the thread that issues API calls. Exposes the
+    writerows() half of the csv writer interface.
+    """
+
+    def __init__(self, writer: Any, max_pending: int = 8) -> None:
+        self._writer = writer
+        self._queue: queue.Queue[Optional[List[Tuple[object, ...]]]] = queue.Queue(
+            maxsize=max_pending
+        )
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._run,
+            name="invoice-csv-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def writerows(self, rows: List[Tuple[object, ...]]) -> None:
+        if self._error is not None:
+            raise self._error
+        self._queue.put(rows)
+
+    def close(self) -> None:
+        """Wait for pending rows to be written; re-raise any write error."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "_BackgroundWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Already failing: flush what we have and keep the original error
+        # propagating, but never drop the write failure without a trace
+        try:
+            self.close()
+        except Exception:
+            logger.exception(
+                "Invoice CSV write failed while handling %s; output may be partial",
+                exc_type.__name__,
+            )
+
+    def _run(self) -> None:
+        while True:
+            rows = self._queue.get()
+            if rows is None:
+                return
+            # After a failure keep draining so producers never block on put()
+            if self._error is None:
+                try:
+                    self._writer.writerows(rows)
+                except Exception as exc:
+                    self._error = exc
+
+
+class _RecentIds:
+    """Membership set that only remembers the last ``capacity`` ids added.
+
+    Paging with Skip/Take repeats an invoice only when rows shift between
+    neighbouring requests, so a window of a few pages catches duplicates
+    without keeping every id of a long sync in memory.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._order: Deque[int] = deque()
+        self._ids: Set[int] = set()
+        self._capacity = max(1, capacity)
+
+    def __contains__(self, invoice_id: object) -> bool:
+        return invoice_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, invoice_id: int) -> None:
+        if invoice_id in self._ids:
+            return
+        if len(self._order) == self._capacity:
+            self._ids.discard(self._order.popleft())
+        self._order.append(invoice_id)
+        self._ids.add(invoice_id)
+
 
 @dataclass
 class InvoiceSyncResult:
@@ -62,6 +242,7 @@ class InvoiceService(BaseService):
 
         self.page_size = int(invoice_cfg.get("page_size", api_cfg.get("page_size", 100)))
         self.retry_delay = float(invoice_cfg.get("detail_retry_delay", 0.2))
+        self.detail_concurrency = max(1, int(invoice_cfg.get("detail_concurrency", 8)))
 
         # Set up output and checkpoint paths
         output_file = invoice_cfg.get("output_file", "invoice_details.csv")
@@ -75,8 +256,11 @@ class InvoiceService(BaseService):
         credentials, headers = self.get_credentials_and_headers()
 
         last_purchase_date = self._load_checkpoint() if incremental else None
+        last_purchase_ts = parse_purchase_date(last_purchase_date)
         is_incremental_run = incremental and last_purchase_date is not None
 
+        # Plain mkdir each run: these services live for the whole scheduler
+        # process, and a directory removed mid-run must not fail every tick
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
         self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -84,6 +268,7 @@ class InvoiceService(BaseService):
         total_invoices = 0
         total_lines = 0
         newest_purchase_date = last_purchase_date
+        newest_purchase_ts = last_purchase_ts
 
         start_time = time.time()
         self._logger.info(
@@ -93,42 +278,69 @@ class InvoiceService(BaseService):
             self.output_path,
         )
 
-        with self.output_path.open(file_mode, newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=INVOICE_HEADERS)
-            if file_mode == "w":
-                writer.writeheader()
+        from_purchase_date = last_purchase_date if is_incremental_run else None
 
-            skip = 0
-            page = 1
-            seen_ids: Set[int] = set()
+        # Exits run in reverse: pending rows are written before the file closes
+        with self._open_csv(self.output_path, file_mode) as handle, ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="invoice-pages",
+        ) as page_executor, ThreadPoolExecutor(
+            max_workers=self.detail_concurrency,
+            thread_name_prefix="invoice-details",
+        ) as executor, _BackgroundWriter(csv.writer(handle)) as writer:
+            if file_mode == "w":
+                writer.writerows([tuple(INVOICE_HEADERS)])
 
-            while True:
+            def fetch_page(page: int, skip: int) -> Future:
                 self._logger.debug(
                     "Fetching invoice page | page=%s | skip=%s",
                     page,
                     skip,
                 )
-
-                page_payload = self._fetch_invoice_page(
+                return page_executor.submit(
+                    self._fetch_invoice_page,
                     credentials=credentials,
                     headers=headers,
                     skip=skip,
-                    from_purchase_date=last_purchase_date if is_incremental_run else None,
+                    from_purchase_date=from_purchase_date,
                 )
+
+            skip = 0
+            page = 1
+            seen_ids = _RecentIds(self.page_size * 4)
+            page_future = fetch_page(page, skip)
+
+            while True:
+                page_payload = page_future.result()
                 invoices_raw = page_payload.get("Data", []) or []
-                invoices = self._filter_invoices(
-                    invoices_raw,
-                    seen_ids,
-                    last_purchase_date,
-                    is_incremental_run,
+                # Filtering feeds submission directly: one pass over the page
+                futures = self._submit_details(
+                    self._filter_invoices(
+                        invoices_raw,
+                        seen_ids,
+                        last_purchase_date,
+                        last_purchase_ts,
+                        is_incremental_run,
+                    ),
+                    headers,
+                    executor,
                 )
 
-                if not invoices:
+                if not futures:
                     break
 
-                processed_invoices, processed_lines, batch_newest = self._process_batch(
-                    invoices,
-                    headers,
+                has_more = self._should_continue(len(futures), is_incremental_run)
+                if has_more:
+                    # Request the next page while this one's details download
+                    page_future = fetch_page(page + 1, skip + self.page_size)
+
+                (
+                    processed_invoices,
+                    processed_lines,
+                    batch_newest,
+                    batch_newest_ts,
+                ) = self._process_batch(
+                    futures,
                     writer,
                     page,
                     start_time,
@@ -138,11 +350,18 @@ class InvoiceService(BaseService):
                 total_lines += processed_lines
 
                 if batch_newest and (
-                    not newest_purchase_date or batch_newest > newest_purchase_date
+                    not newest_purchase_date
+                    or _is_newer(
+                        batch_newest,
+                        batch_newest_ts,
+                        newest_purchase_date,
+                        newest_purchase_ts,
+                    )
                 ):
                     newest_purchase_date = batch_newest
+                    newest_purchase_ts = batch_newest_ts
 
-                if not self._should_continue(invoices, is_incremental_run):
+                if not has_more:
                     break
 
                 skip += self.page_size
@@ -155,11 +374,17 @@ class InvoiceService(BaseService):
             newest_purchase_date
             and (
                 not last_purchase_date
-                or newest_purchase_date > last_purchase_date
+                or _is_newer(
+                    newest_purchase_date,
+                    newest_purchase_ts,
+                    last_purchase_date,
+                    last_purchase_ts,
+                )
             )
         ):
-            self._save_checkpoint(newest_purchase_date)
-            checkpoint_updated = True
+            checkpoint_updated = self._save_checkpoint(newest_purchase_date)
+
+        if checkpoint_updated:
             self._logger.info("Checkpoint updated to %s", newest_purchase_date)
         else:
             self._logger.info("No checkpoint change")
@@ -205,69 +430,116 @@ class InvoiceService(BaseService):
         return self.client.post(
             "/invoices/list",
             headers=headers,
-            params={"format": "json"},
+            params=_LIST_QUERY,
             json_payload=payload,
         )
 
-    def _process_batch(
+    def _submit_details(
         self,
-        invoices: List[Dict[str, object]],
+        invoices: Iterable[Dict[str, object]],
         headers: Dict[str, str],
-        writer: csv.DictWriter,
+        executor: ThreadPoolExecutor,
+    ) -> Dict[Future, Dict[str, object]]:
+        # Detail requests are independent, so keep several in flight and
+        # collect each invoice as soon as its details arrive
+        return {
+            executor.submit(
+                self._fetch_invoice_details,
+                invoice["Id"],
+                headers,
+            ): invoice
+            for invoice in invoices
+        }
+
+    def _process_batch(
+        self,
+        futures: Dict[Future, Dict[str, object]],
+        writer: _BackgroundWriter,
         page: int,
         start_time: float,
-    ) -> Tuple[int, int, Optional[str]]:
+    ) -> Tuple[int, int, Optional[str], Optional[float]]:
         processed_invoices = 0
         processed_lines = 0
         newest_purchase_date: Optional[str] = None
+        newest_purchase_ts: Optional[float] = None
+        rows: List[Tuple[object, ...]] = []
 
+        total = len(futures)
         progress = tqdm(
-            invoices,
+            total=total,
             desc=f"Page {page}",
             unit="invoice",
             leave=False,
+            mininterval=0.5,
         )
 
-        for invoice in progress:
-            invoice_id = int(invoice.get("Id", 0) or 0)
-            invoice_code = str(invoice.get("Code", "") or "")
-            purchase_date = str(invoice.get("PurchaseDate", "") or "")
-
-            details = self._fetch_invoice_details(invoice_id, headers)
-
-            for detail in details:
-                writer.writerow(
-                    {
-                        "InvoiceId": invoice_id,
-                        "InvoiceCode": invoice_code,
-                        "PurchaseDate": purchase_date,
-                        "ProductId": detail.get("ProductId", ""),
-                        "ProductCode": detail.get("ProductCode", ""),
-                        "ProductName": detail.get("ProductName", ""),
-                        "Quantity": detail.get("Quantity", 0),
-                        "Price": detail.get("Price", 0),
-                        "SubTotal": detail.get("SubTotal", 0),
-                    }
+        try:
+            for future in as_completed(futures):
+                invoice = futures[future]
+                # Id and PurchaseDate were normalised by _filter_invoices
+                invoice_id = invoice["Id"]
+                invoice_code = str(invoice.get("Code", "") or "")
+                purchase_date = invoice["PurchaseDate"]
+
+                details = future.result()
+
+                # Tuples in INVOICE_HEADERS order; no per-row dict to build
+                rows.extend(
+                    (
+                        invoice_id,
+                        invoice_code,
+                        purchase_date,
+                        detail.get("ProductId", ""),
+                        detail.get("ProductCode", ""),
+                        detail.get("ProductName", ""),
+                        detail.get("Quantity", 0),
+                        detail.get("Price", 0),
+                        detail.get("SubTotal", 0),
+                    )
+                    for detail in details
                 )
 
-            processed_invoices += 1
-            processed_lines += len(details)
-
-            if purchase_date and (
-                not newest_purchase_date or purchase_date > newest_purchase_date
-            ):
-                newest_purchase_date = purchase_date
-
-            elapsed = time.time() - start_time
-            rate = processed_invoices / elapsed if elapsed > 0 else 0
-            progress.set_postfix(
-                invoices=processed_invoices,
-                lines=processed_lines,
-                rate=f"{rate:.1f}/s",
-            )
-
-        progress.close()
-        return processed_invoices, processed_lines, newest_purchase_date
+                processed_invoices += 1
+                processed_lines += len(details)
+
+                purchase_ts = invoice.get(PURCHASE_TS_KEY)
+                if purchase_date and (
+                    not newest_purchase_date
+                    or _is_newer(
+                        purchase_date,
+                        purchase_ts,
+                        newest_purchase_date,
+                        newest_purchase_ts,
+                    )
+                ):
+                    newest_purchase_date = purchase_date
+                    newest_purchase_ts = purchase_ts
+
+                progress.update(1)
+                # Formatting the postfix per invoice costs more than the
+                # bookkeeping above; refresh it periodically and on the last one
+                if (
+                    processed_invoices % PROGRESS_POSTFIX_EVERY == 0
+                    or processed_invoices == total
+                ):
+                    elapsed = time.time() - start_time
+                    rate = processed_invoices / elapsed if elapsed > 0 else 0
+                    progress.set_postfix(
+                        invoices=processed_invoices,
+                        lines=processed_lines,
+                        rate=f"{rate:.1f}/s",
+                        refresh=False,
+                    )
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        finally:
+            progress.close()
+
+        # One hand-off per page; the background writer does the actual I/O
+        writer.writerows(rows)
+        return processed_invoices, processed_lines, newest_purchase_date, newest_purchase_ts
 
     def _fetch_invoice_details(
         self,
@@ -281,15 +553,7 @@ class InvoiceService(BaseService):
             response = self.client.get(
                 f"/invoices/{invoice_id}/details",
                 headers=headers,
-                params={
-                    "format": "json",
-                    "Includes": [
-                        "ProductName",
-                        "ProductCode",
-                        "SubTotal",
-                        "Product",
-                    ],
-                },
+                params=_DETAIL_QUERY,
             )
         except KiotVietAPIError as exc:
             self._logger.warning(
@@ -308,38 +572,45 @@ class InvoiceService(BaseService):
     def _filter_invoices(
         self,
         invoices: List[Dict[str, object]],
-        seen_ids: Set[int],
+        seen_ids: _RecentIds,
         last_purchase_date: Optional[str],
+        last_purchase_ts: Optional[float],
         is_incremental: bool,
-    ) -> List[Dict[str, object]]:
-        filtered: List[Dict[str, object]] = []
-
+    ) -> Iterator[Dict[str, object]]:
         for invoice in invoices:
             invoice_id = int(invoice.get("Id", 0) or 0)
             if invoice_id <= 0 or invoice_id in seen_ids:
                 continue
 
             purchase_date = str(invoice.get("PurchaseDate", "") or "")
+            purchase_ts = parse_purchase_date(purchase_date)
             if (
                 is_incremental
                 and last_purchase_date
-                and not (purchase_date > last_purchase_date)
+                and not _is_newer(
+                    purchase_date,
+                    purchase_ts,
+                    last_purchase_date,
+                    last_purchase_ts,
+                )
             ):
                 continue
 
+            # Store the coerced values so _process_batch can read them as-is
+            invoice["Id"] = invoice_id
+            invoice["PurchaseDate"] = purchase_date
+            invoice[PURCHASE_TS_KEY] = purchase_ts
             seen_ids.add(invoice_id)
-            filtered.append(invoice)
-
-        return filtered
+            yield invoice
 
     def _should_continue(
         self,
-        invoices: List[Dict[str, object]],
+        invoice_count: int,
         is_incremental: bool,
     ) -> bool:
-        if not invoices:
+        if not invoice_count:
             return False
-        if is_incremental and len(invoices) < self.page_size:
+        if is_incremental and invoice_count < self.page_size:
             return False
         return True
 
@@ -348,9 +619,8 @@ class InvoiceService(BaseService):
             return None
 
         try:
-            with self.checkpoint_path.open("r", encoding="utf-8") as handler:
-                payload = json.load(handler)
-        except json.JSONDecodeError as exc:
+            payload = orjson.loads(self.checkpoint_path.read_bytes())
+        except orjson.JSONDecodeError as exc:
             raise ConfigurationError(
                 f"Invalid checkpoint file {self.checkpoint_path}: {exc}"
             ) from exc
@@ -364,15 +634,28 @@ class InvoiceService(BaseService):
             raise ConfigurationError("last_purchase_date must be a string")
         return checkpoint
 
-    def _save_checkpoint(self, purchase_date: str) -> None:
+    def _save_checkpoint(self, purchase_date: str) -> bool:
+        """Persist purchase_date; return False if the file already holds it."""
         if not purchase_date:
             raise ConfigurationError("purchase_date must be non-empty")
 
+        # Full syncs do not load the checkpoint, so compare against disk here
+        try:
+            if self._load_checkpoint() == purchase_date:
+                return False
+        except ConfigurationError:
+            pass  # Unreadable checkpoint: overwrite it
+
         payload = {"last_purchase_date": purchase_date}
+        # Write beside the target and rename so a crash never leaves a
+        # truncated checkpoint behind
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
         try:
-            with self.checkpoint_path.open("w", encoding="utf-8") as handler:
-                json.dump(payload, handler, ensure_ascii=False, indent=2)
+            tmp_path.write_bytes(orjson.dumps(payload))
+            os.replace(tmp_path, self.checkpoint_path)
         except OSError as exc:
+            tmp_path.unlink(missing_ok=True)
             raise ConfigurationError(
                 f"Cannot write checkpoint file {self.checkpoint_path}: {exc}"
             ) from exc
+        return True
@@ -4,10 +4,13 @@ from __future__ import annotations
 
 import csv
 import math
+import os
 import time
+from itertools import repeat
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence
+from urllib.parse import urlencode
+from typing import Dict, Iterator, List, Optional, Sequence
 
 from tqdm import tqdm
 
@@ -38,6 +41,15 @@ DEFAULT_PRODUCT_FIELDS: Sequence[str] = (
     "CreatedDate",
 )
 
+# Same query on every page; encoded once instead of per request
+_MASTER_PRODUCT_QUERY = urlencode(
+    {
+        "format": "json",
+        "Includes": "ProductAttributes",
+        "ForSummaryRow": "true",
+    }
+)
+
 
 @dataclass
 class ProductExportResult:
@@ -84,6 +96,8 @@ class ProductService(BaseService):
             raise ConfigurationError("page_size cannot exceed 1000")
 
         output_path = Path(output_file) if output_file else self.output_path
+        # Checked on every export: output_file can differ per call, and the
+        # directory may be removed between scheduler ticks
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         start_time = time.time()
@@ -93,33 +107,35 @@ class ProductService(BaseService):
             output_path,
         )
 
-        products = self._fetch_all_products(credentials.branch_id, headers, page_size)
-        self._write_csv(products, output_path, fields)
+        # Pages are written as they arrive instead of holding the catalog
+        pages = self._iter_product_pages(credentials.branch_id, headers, page_size)
+        exported = self._write_csv(pages, output_path, fields)
 
         duration = time.time() - start_time
         self._logger.info(
             "Product export finished | products=%s | duration=%.1fs",
-            len(products),
+            exported,
             duration,
         )
 
         return ProductExportResult(
-            products=len(products),
+            products=exported,
             output_file=output_path,
             duration_seconds=duration,
         )
 
-    def _fetch_all_products(
+    def _iter_product_pages(
         self,
         branch_id: int,
         headers: Dict[str, str],
         page_size: int,
-    ) -> List[Dict[str, object]]:
+    ) -> Iterator[List[Dict[str, object]]]:
+        """Yield non-empty pages of products until the catalog is exhausted."""
         total = self._fetch_total_products(branch_id, headers)
         if total == 0:
-            return []
+            return
 
-        products: List[Dict[str, object]] = []
+        fetched = 0
         total_pages = max(1, math.ceil(total / page_size))
         progress = tqdm(
             range(total_pages),
@@ -128,19 +144,20 @@ class ProductService(BaseService):
             leave=False,
         )
 
-        for index in progress:
-            skip = index * page_size
-            page_data = self._fetch_product_page(branch_id, headers, skip, page_size)
-            items = page_data.get("Data", []) if isinstance(page_data, dict) else []
-            if not isinstance(items, list):
-                raise KiotVietAPIError("Unexpected payload while fetching products")
-            if not items:
-                break
-            products.extend(items)
-            progress.set_postfix(fetched=len(products))
-
-        progress.close()
-        return products
+        try:
+            for index in progress:
+                skip = index * page_size
+                page_data = self._fetch_product_page(branch_id, headers, skip, page_size)
+                items = page_data.get("Data", []) if isinstance(page_data, dict) else []
+                if not isinstance(items, list):
+                    raise KiotVietAPIError("Unexpected payload while fetching products")
+                if not items:
+                    break
+                fetched += len(items)
+                progress.set_postfix(fetched=fetched)
+                yield items
+        finally:
+            progress.close()
 
     def _fetch_total_products(
         self,
@@ -193,32 +210,47 @@ class ProductService(BaseService):
         return self.client.post(
             f"/branchs/{branch_id}/masterproducts",
             headers=headers,
-            params={
-                "format": "json",
-                "Includes": "ProductAttributes",
-                "ForSummaryRow": "true",
-            },
+            params=_MASTER_PRODUCT_QUERY,
             json_payload=payload,
         )
 
     def _write_csv(
         self,
-        products: List[Dict[str, object]],
+        pages: Iterator[List[Dict[str, object]]],
         output_path: Path,
         fields: Sequence[str],
-    ) -> None:
-        if not products:
+    ) -> int:
+        """Write product pages to output_path and return the product count."""
+        first_page = next(pages, None)
+        if first_page is None:
             self._logger.warning("No products returned from API")
-            return
+            return 0
 
+        # Rows are written while later pages are still downloading, so build
+        # the file beside the target and only replace the old export once the
+        # whole catalog has arrived.
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        exported = 0
         try:
-            with output_path.open("w", newline="", encoding="utf-8-sig") as handle:
-                writer = csv.DictWriter(handle, fieldnames=list(fields))
-                writer.writeheader()
-                for product in products:
-                    row = {field: product.get(field, "") for field in fields}
-                    writer.writerow(row)
+            with self._open_csv(tmp_path, encoding="utf-8-sig") as handle:
+                writer = csv.writer(handle)
+                writer.writerow(fields)
+                page: Optional[List[Dict[str, object]]] = first_page
+                while page is not None:
+                    # map() projects each product onto the field order in C
+                    writer.writerows(
+                        map(product.get, fields, repeat(""))
+                        for product in page
+                    )
+                    exported += len(page)
+                    page = next(pages, None)
+            os.replace(tmp_path, output_path)
         except OSError as exc:
+            tmp_path.unlink(missing_ok=True)
             raise ConfigurationError(
                 f"Cannot write product export file {output_path}: {exc}"
             ) from exc
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return exported
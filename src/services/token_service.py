@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import asdict
 from pathlib import Path
-from typing import Dict, Optional, Union
+from typing import Dict, Optional, Tuple, Union
+
+import orjson
 
 from src.api.exceptions import ConfigurationError
 from src.models.credentials import AccessCredentials
@@ -17,6 +18,11 @@ class TokenService:
 
     def __init__(self, token_file: Union[str, Path]) -> None:
         self.token_file = Path(token_file)
+        # (mtime_ns, size) of the file last parsed, with its credentials and
+        # headers; the token only changes when a login rewrites the file
+        self._cached: Optional[
+            Tuple[Tuple[int, int], AccessCredentials, Dict[str, str]]
+        ] = None
         self._logger = logger.getChild(self.__class__.__name__)
 
     def token_exists(self) -> bool:
@@ -25,13 +31,36 @@ class TokenService:
 
     def load(self) -> AccessCredentials:
         """Read credentials from disk and validate them."""
-        if not self.token_file.exists():
-            raise ConfigurationError(f"Token file not found: {self.token_file}")
+        return self.load_with_headers()[0]
+
+    def load_with_headers(self) -> Tuple[AccessCredentials, Dict[str, str]]:
+        """Return credentials and request headers, re-reading only on change.
+
+        The returned objects are shared between calls and must not be mutated.
+        """
+        try:
+            stat = self.token_file.stat()
+        except FileNotFoundError:
+            self._cached = None
+            raise ConfigurationError(f"Token file not found: {self.token_file}") from None
+        except OSError as exc:
+            raise ConfigurationError(
+                f"Cannot read token file {self.token_file}: {exc}"
+            ) from exc
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if self._cached is not None and self._cached[0] == stamp:
+            return self._cached[1], self._cached[2]
+
+        credentials = self._read()
+        headers = self.build_headers(credentials)
+        self._cached = (stamp, credentials, headers)
+        return credentials, headers
 
+    def _read(self) -> AccessCredentials:
         try:
-            with self.token_file.open("r", encoding="utf-8") as handler:
-                data = json.load(handler)
-        except json.JSONDecodeError as exc:
+            data = orjson.loads(self.token_file.read_bytes())
+        except orjson.JSONDecodeError as exc:
             raise ConfigurationError(
                 f"Invalid JSON in token file {self.token_file}: {exc}"
             ) from exc
@@ -49,9 +78,11 @@ class TokenService:
         payload = {key: value for key, value in payload.items() if value is not None}
 
         self.token_file.parent.mkdir(parents=True, exist_ok=True)
+        # A rewrite within the filesystem's timestamp granularity could keep
+        # the same stamp, so never trust the cache across a save
+        self._cached = None
         try:
-            with self.token_file.open("w", encoding="utf-8") as handler:
-                json.dump(payload, handler, ensure_ascii=False, indent=2)
+            self.token_file.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
         except OSError as exc:
             raise ConfigurationError(
                 f"Cannot write token file {self.token_file}: {exc}"
@@ -1,39 +1,120 @@
 """Configuration management"""
 
+import copy
+import functools
 import os
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
 import yaml
 from dotenv import load_dotenv
 
+try:
+    # libyaml-backed loader; PyYAML wheels ship it on common platforms
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 load_dotenv()
 
+_CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
+
+# Parsed YAML keyed by (path, mtime_ns, size), so building another Config
+# only re-parses files that changed on disk
+_YAML_CACHE: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def _load_yaml(path: Path) -> Optional[Dict[str, Any]]:
+    """Return the parsed mapping in path, or None if the file is missing."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    cached = _YAML_CACHE.get(key)
+    if cached is None:
+        # Binary mode: libyaml reads and decodes the bytes itself (UTF-8 or
+        # a BOM-marked UTF-16), so neither the locale nor a text layer is involved
+        with open(path, "rb") as f:
+            cached = yaml.load(f, Loader=_YamlLoader) or {}
+        _YAML_CACHE[key] = cached
+    # Callers own their copy; the cached mapping must never change
+    return copy.deepcopy(cached)
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge override into base in place, recursing into nested sections."""
+    for key, value in override.items():
+        current = base.get(key)
+        if isinstance(current, dict) and isinstance(value, dict):
+            _deep_merge(current, value)
+        else:
+            base[key] = value
+    return base
+
+
 class Config:
     """Configuration manager"""
     
     def __init__(self, env: str = None):
         self.env = env or os.getenv("ENV", "development")
-        self.config_dir = Path(__file__).parent.parent.parent / "config"
-        self._config: Dict[str, Any] = {}
+        self.config_dir = _CONFIG_DIR
+        self._config = {}
         self.load()
+
+    @property
+    def _config(self) -> Mapping[str, Any]:
+        return self._values
+
+    @_config.setter
+    def _config(self, values: Mapping[str, Any]) -> None:
+        # Read-only view so the shared Config can be read from any thread
+        # without a lock; interned keys let lookups with literal strings
+        # match on identity before comparing characters
+        self._values = MappingProxyType({
+            sys.intern(key) if isinstance(key, str) else key: value
+            for key, value in values.items()
+        })
+        # Every assignment gets a fresh lookup cache, so get() never serves
+        # a value from the mapping it replaced
+        self._lookup = functools.lru_cache(maxsize=128)(self._values.__getitem__)
     
     def load(self):
         """Load configuration from YAML files"""
         # Load default config
-        default_path = self.config_dir / "default.yml"
-        if default_path.exists():
-            with open(default_path) as f:
-                self._config = yaml.safe_load(f) or {}
+        default_config = _load_yaml(self.config_dir / "default.yml")
+        if default_config is None:
+            default_config = copy.deepcopy(dict(self._config))
         
-        # Override with environment config
-        env_path = self.config_dir / f"{self.env}.yml"
-        if env_path.exists():
-            with open(env_path) as f:
-                env_config = yaml.safe_load(f) or {}
-                self._config.update(env_config)
+        # Override with environment config; nested sections merge key by key
+        # so an env file only has to list the values it changes
+        env_config = _load_yaml(self.config_dir / f"{self.env}.yml")
+        if env_config is not None:
+            _deep_merge(default_config, env_config)
+        self._config = default_config
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
-        return self._config.get(key, default)
+        try:
+            return self._lookup(key)
+        except KeyError:
+            return default
+
+_config: Optional[Config] = None
+_config_lock = threading.Lock()
+
 
-config = Config()
+def __getattr__(name: str) -> Any:
+    # PEP 562: build the shared Config on first use of ``config`` rather than
+    # at import, so importing Config alone never reads the YAML files
+    global _config
+    if name == "config":
+        if _config is None:
+            with _config_lock:
+                if _config is None:
+                    _config = Config()
+        return _config
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
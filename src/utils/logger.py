@@ -1,41 +1,177 @@
 """Logging configuration"""
 
+import atexit
+import locale
 import logging
+import os
+import queue
 import sys
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, Optional
+
+# One queue and one listener thread serve the file handlers of every logger,
+# so callers only enqueue records and never wait on the disk
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class _CompiledPercentStyle(logging.PercentStyle):
+    """%-style format validated once, with its asctime check answered up front."""
+
+    def __init__(self, fmt: str) -> None:
+        super().__init__(fmt)
+        self.validate()
+        # Formatter.format asks usesTime() for every record; the base class
+        # searches the format string each time
+        self._uses_time = super().usesTime()
+
+    def usesTime(self) -> bool:
+        return self._uses_time
+
+
+def _formatter(fmt: str) -> logging.Formatter:
+    style = _CompiledPercentStyle(fmt)
+    formatter = logging.Formatter()
+    formatter._style = style
+    formatter._fmt = style._fmt
+    return formatter
+
+
+# Formatters hold no per-handler state, so every logger shares these two
+_CONSOLE_FORMAT = _formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+_FILE_FORMAT = _formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+)
+# Every name getattr(logging, level) used to accept, aliases included
+_LEVELS = {
+    "CRITICAL": logging.CRITICAL,
+    "FATAL": logging.FATAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "WARN": logging.WARN,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+    "NOTSET": logging.NOTSET,
+}
+
+
+class _ForwardingHandler(logging.Handler):
+    """Listener-side handler: pass each record to the file handler it targets."""
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        return record._file_handler.handle(record)
+
+
+class FileQueueHandler(QueueHandler):
+    """Queue records for file_handler, which runs on the shared listener thread."""
+
+    def __init__(self, file_handler: logging.Handler) -> None:
+        super().__init__(_log_queue)
+        self.file_handler = file_handler
+        self.setLevel(file_handler.level)
+        _start_listener()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = super().prepare(record)
+        record._file_handler = self.file_handler
+        return record
+
+
+class SizeTrackingRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that counts the bytes it writes.
+
+    The stock shouldRollover seeks and tells the stream for every record
+    (and stats the file on 3.11+). Only this process is assumed to write
+    the file; lines appended by other processes are not counted.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._encoding = self.encoding or locale.getpreferredencoding(False)
+        try:
+            self._size = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._size = 0
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.maxBytes <= 0:
+            return False
+        msg = self.format(record) + self.terminator
+        size = len(msg) if msg.isascii() else len(msg.encode(self._encoding, "replace"))
+        if self._size and self._size + size >= self.maxBytes:
+            # emit() rotates and then writes this record to the new file
+            self._size = size
+            return True
+        self._size += size
+        return False
+
+
+def _start_listener() -> None:
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_log_queue, _ForwardingHandler())
+            _listener.start()
+            # Runs before logging's own shutdown hook, so queued records are
+            # written before the file handlers are closed
+            atexit.register(_listener.stop)
+
 
 def setup_logger(name: str = "kiotviet", level: str = "INFO") -> logging.Logger:
     """Setup logger with file and console handlers"""
     
     logger = logging.getLogger(name)
-    logger.setLevel(getattr(logging, level.upper()))
+    try:
+        logger.setLevel(_LEVELS[level.upper()])
+    except KeyError:
+        raise AttributeError(f"Unknown log level: {level}") from None
+
+    # getLogger returns the same object per name; attaching handlers again
+    # would write every record once per call and leak a file descriptor
+    if logger.handlers:
+        return logger
+    # Our handlers already cover console and file; the root logger's (e.g.
+    # from basicConfig) would print each record a second time
+    logger.propagate = False
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(console_format)
+    console_handler.setFormatter(_CONSOLE_FORMAT)
     
     # File handler
     log_dir = Path("data/logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    file_handler = RotatingFileHandler(
+    file_handler = SizeTrackingRotatingFileHandler(
         log_dir / f"{name}.log",
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5
     )
     file_handler.setLevel(logging.DEBUG)
-    file_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-    )
-    file_handler.setFormatter(file_format)
+    file_handler.setFormatter(_FILE_FORMAT)
     
     logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    logger.addHandler(FileQueueHandler(file_handler))
     
     return logger
 
-logger = setup_logger()
+_logger: Optional[logging.Logger] = None
+_logger_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> Any:
+    # PEP 562: create the log directory and file handler on first use of
+    # ``logger``; the lock keeps concurrent first uses from adding handlers twice
+    global _logger
+    if name == "logger":
+        if _logger is None:
+            with _logger_lock:
+                if _logger is None:
+                    _logger = setup_logger()
+        return _logger
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
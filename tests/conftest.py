@@ -2,6 +2,7 @@
 
 import pytest
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
 @pytest.fixture
 def sample_token():
@@ -18,3 +19,31 @@ def temp_data_dir(tmp_path):
     data_dir = tmp_path / "data"
     data_dir.mkdir()
     return data_dir
+
+@pytest.fixture(scope="module")
+def fake_upload_file(tmp_path_factory):
+    """Small file shared by a module's upload tests"""
+    path = tmp_path_factory.mktemp("upload") / "test_file.txt"
+    path.write_text("test content")
+    return path
+
+@pytest.fixture
+def azure_env(monkeypatch):
+    """Azure storage settings for upload tests"""
+    monkeypatch.setenv("AZURE_STORAGE_CONNECTION_STRING", "test_connection_string")
+    monkeypatch.setenv("AZURE_STORAGE_CONTAINER", "test_container")
+
+@pytest.fixture
+def mock_blob_client():
+    """Patched BlobServiceClient as (service_class, service, blob_client)"""
+    from src.utils.azure_blob import _get_client
+
+    # The shared client is cached per connection string; start and end
+    # every test without one so it always comes from this patch
+    _get_client.cache_clear()
+    with patch("src.utils.azure_blob.BlobServiceClient") as service_class:
+        service = service_class.from_connection_string.return_value
+        blob_client = MagicMock()
+        service.get_blob_client.return_value = blob_client
+        yield service_class, service, blob_client
+    _get_client.cache_clear()
@@ -1,194 +1,229 @@
 """Tests for Azure blob storage utilities."""
 
-import os
-import tempfile
+import gzip
+import io
 from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 
 import pytest
 
-from src.utils.azure_blob import upload_to_azure_blob
+from src.utils.azure_blob import (
+    UPLOAD_BLOCK_SIZE,
+    UPLOAD_MAX_CONCURRENCY,
+    UPLOAD_SINGLE_PUT_SIZE,
+    upload_many_to_azure_blob,
+    upload_to_azure_blob,
+)
+
+
+VIRTUAL_PATH = "/virtual/test_file.txt"
+VIRTUAL_CONTENT = b"test content"
+
+
+@pytest.fixture
+def virtual_file():
+    """Serve VIRTUAL_PATH from memory; the mocked client never reads it."""
+    opener = mock_open(read_data=VIRTUAL_CONTENT)
+    with patch("builtins.open", opener), \
+            patch.object(Path, "exists", return_value=True), \
+            patch.object(Path, "stat", return_value=MagicMock(st_size=len(VIRTUAL_CONTENT))):
+        yield opener
 
 
 class TestUploadToAzureBlob:
     """Test the upload_to_azure_blob function."""
 
-    def test_upload_successful(self):
+    def test_upload_successful(self, azure_env, mock_blob_client, virtual_file):
         """Test successful file upload to Azure Blob Storage."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            temp_file.write("test content")
-            temp_file_path = temp_file.name
-
-        try:
-            with patch.dict(os.environ, {
-                'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string',
-                'AZURE_STORAGE_CONTAINER': 'test_container'
-            }):
-                with patch('src.utils.azure_blob.BlobServiceClient') as mock_blob_service_class:
-                    mock_blob_client = MagicMock()
-                    mock_blob_service_instance = MagicMock()
-                    mock_blob_service_class.from_connection_string.return_value = mock_blob_service_instance
-                    mock_blob_service_instance.get_blob_client.return_value = mock_blob_client
-                    mock_blob_client.url = "https://test.blob.core.windows.net/test/test_file.txt"
-
-                    # Call function
-                    result = upload_to_azure_blob(temp_file_path, "test_file.txt")
-
-                    # Assertions
-                    assert result == "https://test.blob.core.windows.net/test/test_file.txt"
-                    mock_blob_service_class.from_connection_string.assert_called_once_with('test_connection_string')
-                    mock_blob_client.upload_blob.assert_called_once()
-
-        finally:
-            Path(temp_file_path).unlink(missing_ok=True)
-
-    def test_upload_with_default_blob_name(self):
+        service_class, _, blob_client = mock_blob_client
+        blob_client.url = "https://test.blob.core.windows.net/test/test_file.txt"
+
+        # Call function
+        result = upload_to_azure_blob(VIRTUAL_PATH, "test_file.txt")
+
+        # Assertions
+        assert result == "https://test.blob.core.windows.net/test/test_file.txt"
+        service_class.from_connection_string.assert_called_once()
+        args, _ = service_class.from_connection_string.call_args
+        assert args == ('test_connection_string',)
+        blob_client.upload_blob.assert_called_once()
+        virtual_file.assert_called_once_with(Path(VIRTUAL_PATH), "rb", buffering=0)
+
+    def test_upload_uses_parallel_block_upload(self, azure_env, mock_blob_client, fake_upload_file):
+        """Test upload passes the file length and block concurrency to the SDK."""
+        service_class, _, blob_client = mock_blob_client
+
+        upload_to_azure_blob(fake_upload_file)
+
+        args, kwargs = blob_client.upload_blob.call_args
+        assert isinstance(args[0], io.FileIO)
+        assert kwargs["overwrite"] is True
+        assert kwargs["length"] == len("test content")
+        assert kwargs["max_concurrency"] == UPLOAD_MAX_CONCURRENCY
+        assert kwargs["blob_type"] == "BlockBlob"
+        service_class.from_connection_string.assert_called_once_with(
+            'test_connection_string',
+            max_block_size=UPLOAD_BLOCK_SIZE,
+            max_single_put_size=UPLOAD_SINGLE_PUT_SIZE,
+        )
+
+    def test_upload_concurrency_override(self, azure_env, mock_blob_client, virtual_file, monkeypatch):
+        """Test AZURE_STORAGE_MAX_CONCURRENCY sets the number of parallel blocks."""
+        monkeypatch.setenv("AZURE_STORAGE_MAX_CONCURRENCY", "16")
+        _, _, blob_client = mock_blob_client
+
+        upload_to_azure_blob(VIRTUAL_PATH)
+
+        _, kwargs = blob_client.upload_blob.call_args
+        assert kwargs["max_concurrency"] == 16
+
+    def test_upload_invalid_concurrency(self, azure_env, monkeypatch):
+        """Test a non-integer AZURE_STORAGE_MAX_CONCURRENCY is rejected."""
+        monkeypatch.setenv("AZURE_STORAGE_MAX_CONCURRENCY", "many")
+
+        with pytest.raises(ValueError, match="AZURE_STORAGE_MAX_CONCURRENCY"):
+            upload_to_azure_blob("/fake/path.txt")
+
+    @pytest.mark.parametrize("in_memory_limit", [1 << 20, 0])
+    def test_upload_gzip(self, azure_env, mock_blob_client, monkeypatch, tmp_path, in_memory_limit):
+        """Test AZURE_STORAGE_GZIP uploads compressed bytes, in memory or streamed."""
+        monkeypatch.setenv("AZURE_STORAGE_GZIP", "1")
+        monkeypatch.setattr("src.utils.azure_blob.GZIP_IN_MEMORY_LIMIT", in_memory_limit)
+        csv_file = tmp_path / "export.csv"
+        csv_file.write_text("col1,col2\n" * 1000)
+
+        uploaded = {}
+
+        def capture(data, **kwargs):
+            uploaded["body"] = data if isinstance(data, bytes) else data.read()
+            uploaded.update(kwargs)
+
+        _, _, blob_client = mock_blob_client
+        blob_client.upload_blob.side_effect = capture
+
+        upload_to_azure_blob(csv_file)
+
+        assert gzip.decompress(uploaded["body"]) == b"col1,col2\n" * 1000
+        assert uploaded["length"] == len(uploaded["body"])
+        assert uploaded["content_settings"].content_encoding == "gzip"
+
+    def test_upload_with_default_blob_name(self, azure_env, mock_blob_client, virtual_file):
         """Test upload with default blob name (filename)."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as temp_file:
-            temp_file.write("col1,col2\nval1,val2")
-            temp_file_path = temp_file.name
-
-        try:
-            with patch.dict(os.environ, {
-                'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string',
-                'AZURE_STORAGE_CONTAINER': 'test_container'
-            }):
-                with patch('src.utils.azure_blob.BlobServiceClient') as mock_blob_service_class:
-                    mock_blob_client = MagicMock()
-                    mock_blob_service_instance = MagicMock()
-                    mock_blob_service_class.from_connection_string.return_value = mock_blob_service_instance
-                    mock_blob_service_instance.get_blob_client.return_value = mock_blob_client
-                    mock_blob_client.url = "https://test.blob.core.windows.net/test/test.csv"
-
-                    # Call function without blob_name
-                    result = upload_to_azure_blob(temp_file_path)
-
-                    # Should use filename as blob name
-                    expected_blob_name = Path(temp_file_path).name
-                    mock_blob_service_instance.get_blob_client.assert_called_once_with(
-                        container='test_container',
-                        blob=expected_blob_name
-                    )
-
-        finally:
-            Path(temp_file_path).unlink(missing_ok=True)
-
-    def test_upload_missing_connection_string(self):
+        _, service, _ = mock_blob_client
+
+        # Call function without blob_name
+        upload_to_azure_blob(VIRTUAL_PATH)
+
+        # Should use filename as blob name
+        service.get_blob_client.assert_called_once_with(
+            container='test_container',
+            blob="test_file.txt"
+        )
+
+    def test_upload_missing_connection_string(self, monkeypatch):
         """Test upload fails when connection string is missing."""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(ValueError) as exc_info:
-                upload_to_azure_blob("/fake/path.txt")
+        monkeypatch.delenv("AZURE_STORAGE_CONNECTION_STRING", raising=False)
 
-            assert "AZURE_STORAGE_CONNECTION_STRING environment variable is required" in str(exc_info.value)
+        with pytest.raises(ValueError) as exc_info:
+            upload_to_azure_blob("/fake/path.txt")
 
-    def test_upload_missing_container_name(self):
-        """Test upload fails when container name is empty."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            temp_file.write("test content")
-            temp_file_path = temp_file.name
+        assert "AZURE_STORAGE_CONNECTION_STRING environment variable is required" in str(exc_info.value)
 
-        try:
-            with patch.dict(os.environ, {
-                'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string',
-                'AZURE_STORAGE_CONTAINER': ''  # Empty container name
-            }):
-                with pytest.raises(ValueError) as exc_info:
-                    upload_to_azure_blob(temp_file_path)
+    def test_upload_missing_container_name(self, azure_env, monkeypatch):
+        """Test upload fails when container name is empty."""
+        monkeypatch.setenv("AZURE_STORAGE_CONTAINER", "")  # Empty container name
 
-                assert "AZURE_STORAGE_CONTAINER environment variable is required" in str(exc_info.value)
+        with pytest.raises(ValueError) as exc_info:
+            upload_to_azure_blob(VIRTUAL_PATH)
 
-        finally:
-            Path(temp_file_path).unlink(missing_ok=True)
+        assert "AZURE_STORAGE_CONTAINER environment variable is required" in str(exc_info.value)
 
-    def test_upload_file_not_found(self):
+    def test_upload_file_not_found(self, azure_env):
         """Test upload fails when file doesn't exist."""
-        with patch.dict(os.environ, {
-            'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string',
-            'AZURE_STORAGE_CONTAINER': 'test_container'
-        }):
-            with pytest.raises(FileNotFoundError) as exc_info:
-                upload_to_azure_blob("/nonexistent/file.txt")
+        with pytest.raises(FileNotFoundError) as exc_info:
+            upload_to_azure_blob("/nonexistent/file.txt")
 
-            assert "File not found: /nonexistent/file.txt" in str(exc_info.value)
+        assert "File not found: /nonexistent/file.txt" in str(exc_info.value)
 
-    def test_upload_azure_error(self):
+    def test_upload_azure_error(self, azure_env, mock_blob_client, virtual_file):
         """Test upload fails when Azure operation fails."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            temp_file.write("test content")
-            temp_file_path = temp_file.name
-
-        try:
-            with patch.dict(os.environ, {
-                'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string',
-                'AZURE_STORAGE_CONTAINER': 'test_container'
-            }):
-                with patch('src.utils.azure_blob.BlobServiceClient') as mock_blob_service_class:
-                    mock_blob_client = MagicMock()
-                    mock_blob_service_instance = MagicMock()
-                    mock_blob_service_class.from_connection_string.return_value = mock_blob_service_instance
-                    mock_blob_service_instance.get_blob_client.return_value = mock_blob_client
-                    mock_blob_client.upload_blob.side_effect = Exception("Azure error")
-
-                    with pytest.raises(Exception) as exc_info:
-                        upload_to_azure_blob(temp_file_path)
-
-                    assert "Failed to upload" in str(exc_info.value)
-                    assert "Azure error" in str(exc_info.value)
-
-        finally:
-            Path(temp_file_path).unlink(missing_ok=True)
-
-    def test_upload_with_pathlib_path(self):
+        _, _, blob_client = mock_blob_client
+        blob_client.upload_blob.side_effect = Exception("Azure error")
+
+        with pytest.raises(Exception) as exc_info:
+            upload_to_azure_blob(VIRTUAL_PATH)
+
+        assert "Failed to upload" in str(exc_info.value)
+        assert "Azure error" in str(exc_info.value)
+
+    def test_upload_with_pathlib_path(self, azure_env, mock_blob_client, virtual_file):
         """Test upload works with pathlib.Path objects."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            temp_file.write("test content")
-            temp_file_path = Path(temp_file.name)
-
-        try:
-            with patch.dict(os.environ, {
-                'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string',
-                'AZURE_STORAGE_CONTAINER': 'test_container'
-            }):
-                with patch('src.utils.azure_blob.BlobServiceClient') as mock_blob_service_class:
-                    mock_blob_client = MagicMock()
-                    mock_blob_service_instance = MagicMock()
-                    mock_blob_service_class.from_connection_string.return_value = mock_blob_service_instance
-                    mock_blob_service_instance.get_blob_client.return_value = mock_blob_client
-                    mock_blob_client.url = "https://test.blob.core.windows.net/test/test_file.txt"
-
-                    # Call function with Path object
-                    result = upload_to_azure_blob(temp_file_path, "test_file.txt")
-
-                    assert result == "https://test.blob.core.windows.net/test/test_file.txt"
-
-        finally:
-            temp_file_path.unlink(missing_ok=True)
-
-    def test_upload_default_container_name(self):
+        _, _, blob_client = mock_blob_client
+        blob_client.url = "https://test.blob.core.windows.net/test/test_file.txt"
+
+        # Call function with Path object
+        result = upload_to_azure_blob(Path(VIRTUAL_PATH), "test_file.txt")
+
+        assert result == "https://test.blob.core.windows.net/test/test_file.txt"
+
+    def test_upload_default_container_name(self, azure_env, mock_blob_client, virtual_file, monkeypatch):
         """Test upload uses default container name when not specified."""
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as temp_file:
-            temp_file.write("test content")
-            temp_file_path = temp_file.name
-
-        try:
-            with patch.dict(os.environ, {
-                'AZURE_STORAGE_CONNECTION_STRING': 'test_connection_string'
-                # AZURE_STORAGE_CONTAINER not set
-            }):
-                with patch('src.utils.azure_blob.BlobServiceClient') as mock_blob_service_class:
-                    mock_blob_client = MagicMock()
-                    mock_blob_service_instance = MagicMock()
-                    mock_blob_service_class.from_connection_string.return_value = mock_blob_service_instance
-                    mock_blob_service_instance.get_blob_client.return_value = mock_blob_client
-
-                    # This should work with default container name
-                    upload_to_azure_blob(temp_file_path)
-
-                    # Should use default container name
-                    mock_blob_service_instance.get_blob_client.assert_called_once_with(
-                        container='kiotviet-data',
-                        blob=Path(temp_file_path).name
-                    )
-
-        finally:
-            Path(temp_file_path).unlink(missing_ok=True)
\ No newline at end of file
+        monkeypatch.delenv("AZURE_STORAGE_CONTAINER")
+        _, service, _ = mock_blob_client
+
+        # This should work with default container name
+        upload_to_azure_blob(VIRTUAL_PATH)
+
+        # Should use default container name
+        service.get_blob_client.assert_called_once_with(
+            container='kiotviet-data',
+            blob="test_file.txt"
+        )
+
+    def test_upload_reuses_client(self, azure_env, mock_blob_client, virtual_file):
+        """Test repeated uploads share one BlobServiceClient."""
+        service_class, service, _ = mock_blob_client
+
+        upload_to_azure_blob(VIRTUAL_PATH)
+        upload_to_azure_blob(VIRTUAL_PATH)
+
+        service_class.from_connection_string.assert_called_once()
+        assert service.get_blob_client.call_count == 2
+
+
+class TestUploadManyToAzureBlob:
+    """Test the upload_many_to_azure_blob function."""
+
+    def test_upload_many_returns_urls_in_order(self, azure_env, mock_blob_client, tmp_path):
+        """Test every file is uploaded and URLs follow the input order."""
+        paths = []
+        for name in ("a.csv", "b.csv", "c.csv"):
+            path = tmp_path / name
+            path.write_text("col1\n")
+            paths.append(path)
+
+        def blob_client(container, blob):
+            client = MagicMock()
+            client.url = f"https://test.blob.core.windows.net/{container}/{blob}"
+            return client
+
+        service_class, service, _ = mock_blob_client
+        service.get_blob_client.side_effect = blob_client
+
+        urls = upload_many_to_azure_blob(paths, max_workers=2)
+
+        assert urls == [
+            f"https://test.blob.core.windows.net/test_container/{name}"
+            for name in ("a.csv", "b.csv", "c.csv")
+        ]
+        service_class.from_connection_string.assert_called_once()
+
+    def test_upload_many_propagates_failure(self, azure_env, mock_blob_client, tmp_path):
+        """Test a failed upload is raised to the caller."""
+        path = tmp_path / "a.csv"
+        path.write_text("col1\n")
+        _, _, blob_client = mock_blob_client
+        blob_client.upload_blob.side_effect = Exception("Azure error")
+
+        with pytest.raises(Exception, match="Azure error"):
+            upload_many_to_azure_blob([path, tmp_path / "missing.csv"])
@@ -0,0 +1,21 @@
+"""Tests for shared service helpers."""
+
+from unittest.mock import MagicMock, patch
+
+from src.services import BaseService
+
+
+class TestEnsureDir:
+    """Test directory creation caching."""
+
+    def test_directory_is_created_once(self, temp_data_dir):
+        """Test repeated calls only hit the filesystem the first time."""
+        service = BaseService(client=MagicMock(), token_service=MagicMock())
+        target = temp_data_dir / "output" / "nested"
+
+        service.ensure_dir(target)
+        assert target.is_dir()
+
+        with patch("pathlib.Path.mkdir") as mock_mkdir:
+            service.ensure_dir(target)
+        mock_mkdir.assert_not_called()
@@ -0,0 +1,168 @@
+"""Tests for the KiotViet HTTP client."""
+
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+
+from src.api.client import MAX_RETRY_DELAY, KiotVietClient
+from src.api.exceptions import AuthenticationError, KiotVietAPIError, RateLimitError
+
+
+def _response(status_code, headers=None, content=b"{}"):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.ok = 200 <= status_code < 400
+    response.content = content
+    return response
+
+
+class TestSession:
+    """Test the default session setup."""
+
+    def test_default_session_requests_compression(self):
+        """Test the built session asks for compressed, kept-alive responses."""
+        client = KiotVietClient("https://api.example.com")
+
+        assert client.session.headers["Accept-Encoding"] == "gzip, deflate"
+        assert client.session.headers["Connection"] == "keep-alive"
+        assert client.session.headers["User-Agent"].startswith("kiotviet-integration/")
+
+    def test_default_session_ignores_environment(self):
+        """Test proxy/netrc lookup is off unless trust_env is requested."""
+        assert KiotVietClient("https://api.example.com").session.trust_env is False
+        assert KiotVietClient("https://api.example.com", trust_env=True).session.trust_env is True
+
+    def test_default_session_pool_size(self):
+        """Test the HTTPS adapter uses the requested pool size."""
+        client = KiotVietClient("https://api.example.com", pool_maxsize=48)
+
+        adapter = client.session.get_adapter("https://api.example.com")
+        assert adapter._pool_maxsize == 48
+
+
+class TestBuildUrl:
+    """Test endpoint to URL resolution."""
+
+    def test_relative_endpoints_are_joined_to_base_url(self):
+        """Test relative endpoints with and without a leading slash."""
+        client = KiotVietClient("https://api.example.com/api/")
+
+        assert client._build_url("invoices/list") == "https://api.example.com/api/invoices/list"
+        assert client._build_url("/invoices/list") == "https://api.example.com/api/invoices/list"
+
+    def test_absolute_urls_are_returned_unchanged(self):
+        """Test absolute URLs bypass the base URL."""
+        client = KiotVietClient("https://api.example.com/api")
+
+        assert client._build_url("https://other.example.com/x") == "https://other.example.com/x"
+
+
+class TestResponseDecoding:
+    """Test JSON decoding of successful responses."""
+
+    def test_json_payload_is_decoded(self):
+        """Test the response body is returned as a dict."""
+        session = MagicMock()
+        session.request.return_value = _response(200, content=b'{"Data": [1, 2]}')
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        assert client.get("/x", headers={}) == {"Data": [1, 2]}
+
+    def test_no_content_skips_body(self):
+        """Test 204 responses return an empty payload without reading the body."""
+        session = MagicMock()
+        response = _response(204)
+        type(response).content = PropertyMock(side_effect=AssertionError("body read"))
+        session.request.return_value = response
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        assert client.get("/x", headers={}) == {}
+        response.close.assert_called_once()
+
+    def test_invalid_json_raises_api_error(self):
+        """Test malformed bodies are reported as KiotVietAPIError."""
+        session = MagicMock()
+        session.request.return_value = _response(200, content=b"<html>")
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        with pytest.raises(KiotVietAPIError, match="Invalid JSON response"):
+            client.get("/x", headers={})
+
+
+class TestRetryAfter:
+    """Test Retry-After handling."""
+
+    def test_retry_after_seconds(self):
+        """Test a delay given in seconds."""
+        assert KiotVietClient._retry_after(_response(429, {"Retry-After": "3"})) == 3.0
+
+    def test_retry_after_http_date_in_the_past(self):
+        """Test an HTTP-date already in the past means retry immediately."""
+        response = _response(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        assert KiotVietClient._retry_after(response) == 0.0
+
+    def test_retry_after_missing_or_invalid(self):
+        """Test missing or unparsable headers fall back to backoff."""
+        assert KiotVietClient._retry_after(_response(429)) is None
+        assert KiotVietClient._retry_after(_response(429, {"Retry-After": "soon"})) is None
+
+    def test_rate_limit_sleeps_for_retry_after(self):
+        """Test 429 responses wait for the server-provided delay."""
+        session = MagicMock()
+        session.request.side_effect = [
+            _response(429, {"Retry-After": "2"}),
+            _response(200),
+        ]
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        with patch("src.api.client.time.sleep") as mock_sleep:
+            assert client.get("/x", headers={}) == {}
+
+        mock_sleep.assert_called_once_with(2.0)
+
+    def test_backoff_is_capped(self):
+        """Test delays never exceed MAX_RETRY_DELAY."""
+        session = MagicMock()
+        session.request.return_value = _response(429, {"Retry-After": "3600"})
+        client = KiotVietClient("https://api.example.com", max_retries=1, session=session)
+
+        with patch("src.api.client.time.sleep") as mock_sleep:
+            with pytest.raises(RateLimitError):
+                client.get("/x", headers={})
+
+        mock_sleep.assert_called_once_with(MAX_RETRY_DELAY)
+
+
+class TestStatusHandling:
+    """Test error status dispatch."""
+
+    def test_unauthorized_is_not_retried(self):
+        """Test 401 raises AuthenticationError on the first attempt."""
+        session = MagicMock()
+        session.request.return_value = _response(401)
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        with pytest.raises(AuthenticationError):
+            client.get("/x", headers={})
+        assert session.request.call_count == 1
+
+    def test_server_errors_are_retried(self):
+        """Test 5xx responses are retried before succeeding."""
+        session = MagicMock()
+        session.request.side_effect = [_response(502), _response(200, content=b'{"ok": 1}')]
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        with patch("src.api.client.time.sleep"):
+            assert client.get("/x", headers={}) == {"ok": 1}
+        assert session.request.call_count == 2
+
+    def test_client_errors_raise_api_error(self):
+        """Test other 4xx responses raise without retrying."""
+        session = MagicMock()
+        session.request.return_value = _response(404)
+        client = KiotVietClient("https://api.example.com", session=session)
+
+        with pytest.raises(KiotVietAPIError, match="API request failed: 404"):
+            client.get("/x", headers={})
+        assert session.request.call_count == 1
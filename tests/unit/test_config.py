@@ -21,6 +21,10 @@ class TestConfig:
             assert config.env == "development"
             assert config.config_dir.name == "config"
 
+    def test_config_dir_is_shared(self):
+        """Test instances reuse the module-level config directory."""
+        assert Config("development").config_dir is Config("staging").config_dir
+
     def test_config_init_custom_env(self):
         """Test Config initialization with custom environment."""
         with patch.dict(os.environ, {"ENV": "production"}):
@@ -55,19 +59,30 @@ class TestConfig:
 
     def test_config_load_with_env_override(self):
         """Test loading configuration with environment override."""
-        # Skip this test as the current implementation does shallow merging
-        # and complex mocking is causing issues. The behavior is tested in other tests.
-        pass
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_dir = Path(temp_dir)
+            (config_dir / "default.yml").write_text(
+                "api:\n  timeout: 30\n  page_size: 100\nlogging:\n  level: INFO\n"
+            )
+            (config_dir / "production.yml").write_text(
+                "api:\n  timeout: 60\nlogging: WARNING\nextra: true\n"
+            )
+
+            config = Config("production")
+            config.config_dir = config_dir
+            config.load()
+
+            # Nested keys merge; non-dict overrides replace the section
+            assert config.get("api") == {"timeout": 60, "page_size": 100}
+            assert config.get("logging") == "WARNING"
+            assert config.get("extra") is True
 
     def test_config_load_missing_files(self):
         """Test loading configuration when files don't exist."""
         with tempfile.TemporaryDirectory() as temp_dir:
             config_dir = Path(temp_dir)
 
-            with patch('src.utils.config.Path') as mock_path:
-                mock_path.return_value.parent.parent.parent = config_dir
-                mock_path.return_value.__truediv__ = lambda self, x: config_dir / x
-
+            with patch('src.utils.config._CONFIG_DIR', config_dir):
                 config = Config("development")
                 config.load()
 
@@ -104,4 +119,116 @@ class TestConfig:
         assert config.get("number") == 42
         assert config.get("nested") == {"key": "nested_value"}
         assert config.get("missing") is None
-        assert config.get("missing", "default") == "default"
\ No newline at end of file
+        assert config.get("missing", "default") == "default"
+
+    def test_config_is_read_only(self):
+        """Test loaded settings cannot be replaced through the mapping."""
+        config = Config()
+        config._config = {"api": {"timeout": 30}}
+
+        with pytest.raises(TypeError):
+            config._config["api"] = {}
+        assert config.get("api") == {"timeout": 30}
+
+    def test_config_get_is_memoized(self):
+        """Test repeated get calls hit the lookup cache."""
+        config = Config()
+        config._config = {"api": {"timeout": 30}}
+
+        config.get("api")
+        config.get("api")
+
+        assert config._lookup.cache_info().hits == 1
+
+    def test_config_get_sees_reloaded_values(self, tmp_path):
+        """Test load() drops lookups cached from the previous mapping."""
+        default_file = tmp_path / "default.yml"
+        default_file.write_text("api:\n  timeout: 30\n")
+
+        config = Config("development")
+        config.config_dir = tmp_path
+        config.load()
+        assert config.get("api") == {"timeout": 30}
+
+        default_file.write_text("api:\n  timeout: 60\n")
+        stat = default_file.stat()
+        os.utime(default_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        config.load()
+
+        assert config.get("api") == {"timeout": 60}
+
+class TestYamlCache:
+    """Test that unchanged YAML files are parsed once."""
+
+    def test_unchanged_files_are_not_reparsed(self, tmp_path):
+        """Test a second load reuses the parsed default config."""
+        (tmp_path / "default.yml").write_text("api:\n  timeout: 30\n")
+
+        config = Config("development")
+        config.config_dir = tmp_path
+        config.load()
+
+        with patch("src.utils.config.yaml.load") as mock_load:
+            config.load()
+
+        mock_load.assert_not_called()
+        assert config.get("api") == {"timeout": 30}
+
+    def test_utf8_values_are_decoded(self, tmp_path):
+        """Test non-ASCII values load regardless of the locale encoding."""
+        (tmp_path / "default.yml").write_bytes("store:\n  name: Cửa hàng\n".encode("utf-8"))
+
+        config = Config("development")
+        config.config_dir = tmp_path
+        config.load()
+
+        assert config.get("store") == {"name": "Cửa hàng"}
+
+    def test_changed_file_is_reparsed(self, tmp_path):
+        """Test editing a file invalidates its cached parse."""
+        default_file = tmp_path / "default.yml"
+        default_file.write_text("api:\n  timeout: 30\n")
+
+        config = Config("development")
+        config.config_dir = tmp_path
+        config.load()
+
+        default_file.write_text("api:\n  timeout: 60\n")
+        stat = default_file.stat()
+        os.utime(default_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        config.load()
+
+        assert config.get("api") == {"timeout": 60}
+
+    def test_cached_values_are_isolated(self, tmp_path):
+        """Test mutating one Config does not leak into the next."""
+        (tmp_path / "default.yml").write_text("api:\n  timeout: 30\n")
+
+        first = Config("development")
+        first.config_dir = tmp_path
+        first.load()
+        first.get("api")["timeout"] = 1
+
+        second = Config("development")
+        second.config_dir = tmp_path
+        second.load()
+
+        assert second.get("api") == {"timeout": 30}
+
+
+class TestSharedConfig:
+    """Test the lazily built module-level config."""
+
+    def test_config_is_built_once(self):
+        """Test repeated access returns the same instance."""
+        import src.utils.config as config_module
+
+        assert config_module.config is config_module.config
+        assert isinstance(config_module.config, Config)
+
+    def test_unknown_attribute_raises(self):
+        """Test the module __getattr__ only serves ``config``."""
+        import src.utils.config as config_module
+
+        with pytest.raises(AttributeError):
+            config_module.missing_attribute
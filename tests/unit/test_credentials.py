@@ -88,4 +88,16 @@ class TestAccessCredentials:
         assert creds.access_token == "new_token"
         assert creds.retailer_id == "new_retailer"
         assert creds.branch_id == 456
-        assert creds.expires_at == "2024-01-01"
\ No newline at end of file
+        assert creds.expires_at == "2024-01-01"
+
+    def test_access_credentials_uses_slots(self):
+        """Test that instances carry slots instead of a per-instance dict."""
+        creds = AccessCredentials(
+            access_token="test_token",
+            retailer_id="test_retailer",
+            branch_id=123
+        )
+
+        assert not hasattr(creds, "__dict__")
+        with pytest.raises(AttributeError):
+            creds.unknown_field = "value"
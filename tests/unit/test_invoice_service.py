@@ -0,0 +1,342 @@
+"""Tests for invoice service helpers."""
+
+import csv
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from src.models.credentials import AccessCredentials
+from src.services.invoice_service import (
+    INVOICE_HEADERS,
+    InvoiceService,
+    _BackgroundWriter,
+    _DETAIL_QUERY,
+    _RecentIds,
+    _is_newer,
+    parse_purchase_date,
+)
+
+
+class TestParsePurchaseDate:
+    """Test PurchaseDate parsing for checkpoint comparisons."""
+
+    def test_seven_digit_fraction_is_truncated(self):
+        """Test KiotViet's 100ns precision parses to microseconds."""
+        assert parse_purchase_date("2024-01-15T10:30:00.1234567") == parse_purchase_date(
+            "2024-01-15T10:30:00.123456"
+        )
+
+    def test_naive_values_are_read_as_utc(self):
+        """Test naive and explicit UTC timestamps compare equal."""
+        assert parse_purchase_date("2024-01-15T10:30:00") == parse_purchase_date(
+            "2024-01-15T10:30:00Z"
+        )
+
+    def test_offsets_are_honoured(self):
+        """Test values in different zones order by instant, not by text."""
+        earlier = parse_purchase_date("2024-01-15T12:00:00+07:00")
+        later = parse_purchase_date("2024-01-15T06:00:00+00:00")
+        assert earlier < later
+
+    def test_unparsable_values_return_none(self):
+        """Test empty or malformed values are reported as None."""
+        assert parse_purchase_date("") is None
+        assert parse_purchase_date(None) is None
+        assert parse_purchase_date("yesterday") is None
+
+
+class TestIsNewer:
+    """Test ordering of PurchaseDate values against the checkpoint."""
+
+    @staticmethod
+    def _newer(value, reference):
+        return _is_newer(
+            value, parse_purchase_date(value), reference, parse_purchase_date(reference)
+        )
+
+    def test_hundred_nanoseconds_later_is_newer(self):
+        """Test the 7th fractional digit breaks a same-microsecond tie."""
+        assert self._newer("2024-01-15T10:30:00.1234568", "2024-01-15T10:30:00.1234567")
+        assert not self._newer("2024-01-15T10:30:00.1234567", "2024-01-15T10:30:00.1234568")
+
+    def test_equal_instants_are_not_newer(self):
+        """Test the same instant is never treated as newer, whatever the notation."""
+        assert not self._newer("2024-01-15T10:30:00.1234567", "2024-01-15T10:30:00.1234567")
+        assert not self._newer("2024-01-15T10:30:00.1234560Z", "2024-01-15T10:30:00.123456")
+
+    def test_unparsable_values_fall_back_to_text(self):
+        """Test values that do not parse keep the string ordering."""
+        assert self._newer("b", "a")
+        assert not self._newer("a", "b")
+
+
+class TestBackgroundWriter:
+    """Test the thread that writes invoice rows."""
+
+    def test_batches_are_written_in_order(self):
+        """Test every batch reaches the csv writer before close() returns."""
+        writer = MagicMock()
+        with _BackgroundWriter(writer, max_pending=1) as background:
+            for batch in range(5):
+                background.writerows([(batch,)])
+
+        assert [c.args[0] for c in writer.writerows.call_args_list] == [
+            [(batch,)] for batch in range(5)
+        ]
+
+    def test_write_errors_are_raised_on_close(self):
+        """Test a failing write surfaces in the producing thread."""
+        writer = MagicMock()
+        writer.writerows.side_effect = OSError("disk full")
+        background = _BackgroundWriter(writer)
+        background.writerows([(1,)])
+
+        with pytest.raises(OSError, match="disk full"):
+            background.close()
+
+
+    def test_write_error_is_logged_when_already_failing(self):
+        """Test a write failure during another error is logged, not dropped."""
+        writer = MagicMock()
+        writer.writerows.side_effect = OSError("disk full")
+
+        with patch("src.services.invoice_service.logger") as mock_logger:
+            with pytest.raises(RuntimeError, match="api down"):
+                with _BackgroundWriter(writer) as background:
+                    background.writerows([(1,)])
+                    raise RuntimeError("api down")
+
+        mock_logger.exception.assert_called_once()
+        assert "RuntimeError" in mock_logger.exception.call_args.args
+
+
+class TestRecentIds:
+    """Test the bounded duplicate filter used while paging."""
+
+    def test_remembers_recent_ids(self):
+        """Test ids within the window are reported as seen."""
+        seen = _RecentIds(3)
+        for invoice_id in (1, 2, 3):
+            seen.add(invoice_id)
+
+        assert 1 in seen and 3 in seen
+        assert 4 not in seen
+
+    def test_oldest_ids_are_evicted(self):
+        """Test memory stays bounded by dropping the oldest id."""
+        seen = _RecentIds(3)
+        for invoice_id in (1, 2, 3, 4):
+            seen.add(invoice_id)
+
+        assert 1 not in seen
+        assert 4 in seen
+        assert len(seen) == 3
+
+
+class TestCheckpoint:
+    """Test checkpoint persistence."""
+
+    @pytest.fixture
+    def service(self, temp_data_dir):
+        service = InvoiceService.__new__(InvoiceService)
+        service.checkpoint_path = temp_data_dir / "checkpoint.json"
+        return service
+
+    def test_save_writes_atomically(self, service):
+        """Test the checkpoint is written and no temporary file is left."""
+        assert service._save_checkpoint("2024-01-15T10:30:00") is True
+
+        assert service._load_checkpoint() == "2024-01-15T10:30:00"
+        assert list(service.checkpoint_path.parent.iterdir()) == [service.checkpoint_path]
+
+    def test_unchanged_checkpoint_is_not_rewritten(self, service):
+        """Test saving the stored value again leaves the file untouched."""
+        service._save_checkpoint("2024-01-15T10:30:00")
+        mtime = service.checkpoint_path.stat().st_mtime_ns
+
+        assert service._save_checkpoint("2024-01-15T10:30:00") is False
+        assert service.checkpoint_path.stat().st_mtime_ns == mtime
+
+    def test_corrupt_checkpoint_is_replaced(self, service):
+        """Test an unreadable checkpoint is overwritten instead of raising."""
+        service.checkpoint_path.write_text("{not json", encoding="utf-8")
+
+        assert service._save_checkpoint("2024-01-15T10:30:00") is True
+        assert service._load_checkpoint() == "2024-01-15T10:30:00"
+
+
+class TestDetailQuery:
+    """Test the pre-encoded invoice detail query string."""
+
+    def test_matches_dict_encoding(self):
+        """Test the cached query produces the same URL as the params dict."""
+        url = "https://api.example.com/invoices/1/details"
+        expected = requests.Request(
+            "GET",
+            url,
+            params={
+                "format": "json",
+                "Includes": ["ProductName", "ProductCode", "SubTotal", "Product"],
+            },
+        ).prepare().url
+
+        assert requests.Request("GET", url, params=_DETAIL_QUERY).prepare().url == expected
+
+
+class FakeInvoiceClient:
+    """Serve invoice list pages by Skip and one detail line per invoice."""
+
+    def __init__(self, pages, page_size, fetch_detail=None):
+        self.pages = pages
+        self.page_size = page_size
+        self.fetch_detail = fetch_detail
+        self.list_payloads = []
+        self.detail_ids = []
+        self._lock = threading.Lock()
+
+    def post(self, path, headers=None, params=None, json_payload=None):
+        with self._lock:
+            self.list_payloads.append(json_payload)
+        index = json_payload["Skip"] // self.page_size
+        page = self.pages[index] if index < len(self.pages) else []
+        # sync() normalises the dicts in place; hand out fresh copies
+        return {"Data": [dict(invoice) for invoice in page]}
+
+    def get(self, path, headers=None, params=None):
+        invoice_id = int(path.split("/")[2])
+        with self._lock:
+            self.detail_ids.append(invoice_id)
+        if self.fetch_detail is not None:
+            self.fetch_detail(invoice_id)
+        return {"Data": [{"ProductId": invoice_id * 10, "Quantity": 1}]}
+
+
+def _invoice(invoice_id, purchase_date):
+    return {"Id": invoice_id, "Code": f"HD{invoice_id}", "PurchaseDate": purchase_date}
+
+
+def _read_rows(path):
+    with path.open(newline="", encoding="utf-8") as handle:
+        return list(csv.reader(handle))
+
+
+class TestSync:
+    """Test sync() end to end against a fake API client."""
+
+    @pytest.fixture
+    def make_service(self, temp_data_dir):
+        def make(client, page_size):
+            service = InvoiceService.__new__(InvoiceService)
+            service.client = client
+            service.page_size = page_size
+            service.detail_concurrency = 2
+            service.output_path = temp_data_dir / "output" / "invoices.csv"
+            service.checkpoint_path = temp_data_dir / "checkpoints" / "checkpoint.json"
+            service._logger = MagicMock()
+            service.get_credentials_and_headers = MagicMock(
+                return_value=(AccessCredentials("token", "retailer", 1), {})
+            )
+            return service
+        return make
+
+    def test_full_sync_writes_header_and_all_pages(self, make_service):
+        """Test a full sync rewrites the file and pages until an empty page."""
+        client = FakeInvoiceClient(
+            [
+                [_invoice(1, "2024-01-01T08:00:00"), _invoice(2, "2024-01-03T08:00:00"),
+                 _invoice(3, "2024-01-02T08:00:00")],
+                [_invoice(4, "2024-01-04T08:00:00")],
+            ],
+            page_size=3,
+        )
+        service = make_service(client, page_size=3)
+        service.output_path.parent.mkdir(parents=True)
+        service.output_path.write_text("stale\n", encoding="utf-8")
+
+        result = service.sync(incremental=False)
+
+        rows = _read_rows(service.output_path)
+        assert rows[0] == INVOICE_HEADERS
+        assert sorted(int(row[0]) for row in rows[1:]) == [1, 2, 3, 4]
+        # Full mode only stops on an empty page
+        assert [p["Skip"] for p in client.list_payloads] == [0, 3, 6]
+        assert all(p["TimeRange"] == "month" for p in client.list_payloads)
+        assert (result.invoices, result.lines) == (4, 4)
+        assert result.checkpoint_updated is True
+        assert service._load_checkpoint() == "2024-01-04T08:00:00"
+
+    def test_incremental_sync_appends_without_prefetch(self, make_service):
+        """Test an incremental run appends new rows and stops on a short page."""
+        client = FakeInvoiceClient(
+            [[_invoice(1, "2024-01-05T08:00:00"), _invoice(2, "2024-01-12T08:00:00"),
+              _invoice(3, "2024-01-11T08:00:00")]],
+            page_size=3,
+        )
+        service = make_service(client, page_size=3)
+        service.checkpoint_path.parent.mkdir(parents=True)
+        service._save_checkpoint("2024-01-10T00:00:00")
+        service.output_path.parent.mkdir(parents=True)
+        with service.output_path.open("w", newline="", encoding="utf-8") as handle:
+            csv.writer(handle).writerows([INVOICE_HEADERS, ["9"] * len(INVOICE_HEADERS)])
+
+        result = service.sync(incremental=True)
+
+        rows = _read_rows(service.output_path)
+        assert rows[0] == INVOICE_HEADERS
+        assert rows[1][0] == "9"
+        assert sorted(int(row[0]) for row in rows[2:]) == [2, 3]
+        # Two new invoices fill less than a page, so no second list request
+        assert len(client.list_payloads) == 1
+        assert client.list_payloads[0]["PurchaseDateFrom"] == "2024-01-10T00:00:00"
+        assert sorted(client.detail_ids) == [2, 3]
+        assert result.incremental is True
+        assert result.checkpoint_updated is True
+        assert service._load_checkpoint() == "2024-01-12T08:00:00"
+
+    def test_detail_failure_cancels_pending_and_keeps_earlier_pages(self, make_service):
+        """Test a raising detail fetch cancels queued work and earlier rows survive."""
+        batches = []
+
+        def fetch_detail(invoice_id):
+            if invoice_id == 4:
+                raise RuntimeError("detail failed")
+            if invoice_id == 5:
+                # Hold this worker until sync() has reacted to invoice 4
+                deadline = time.monotonic() + 5
+                while not any(f.cancelled() for f in batches[-1]):
+                    assert time.monotonic() < deadline
+                    time.sleep(0.001)
+
+        client = FakeInvoiceClient(
+            [
+                [_invoice(1, "2024-01-01T08:00:00"), _invoice(2, "2024-01-02T08:00:00"),
+                 _invoice(3, "2024-01-03T08:00:00")],
+                [_invoice(4, "2024-01-04T08:00:00"), _invoice(5, "2024-01-05T08:00:00"),
+                 _invoice(6, "2024-01-06T08:00:00")],
+            ],
+            page_size=3,
+            fetch_detail=fetch_detail,
+        )
+        service = make_service(client, page_size=3)
+        # One worker: invoice 6 stays queued while invoice 5 runs
+        service.detail_concurrency = 1
+        submit_details = service._submit_details
+
+        def record_batch(*args):
+            futures = submit_details(*args)
+            batches.append(futures)
+            return futures
+
+        service._submit_details = record_batch
+
+        with pytest.raises(RuntimeError, match="detail failed"):
+            service.sync(incremental=False)
+
+        rows = _read_rows(service.output_path)
+        assert rows[0] == INVOICE_HEADERS
+        assert sorted(int(row[0]) for row in rows[1:]) == [1, 2, 3]
+        assert 6 not in client.detail_ids
+        assert not service.checkpoint_path.exists()
@@ -7,7 +7,7 @@ from unittest.mock import patch, MagicMock
 
 import pytest
 
-from src.utils.logger import setup_logger
+from src.utils.logger import SizeTrackingRotatingFileHandler, setup_logger
 
 
 class TestSetupLogger:
@@ -26,8 +26,10 @@ class TestSetupLogger:
         assert isinstance(console_handler, logging.StreamHandler)
         assert console_handler.level == logging.INFO
 
-        # Check file handler
-        file_handler = logger.handlers[1]
+        # Check file handler, which is written from the listener thread
+        queue_handler = logger.handlers[1]
+        assert isinstance(queue_handler, logging.handlers.QueueHandler)
+        file_handler = queue_handler.file_handler
         assert isinstance(file_handler, logging.handlers.RotatingFileHandler)
         assert file_handler.level == logging.DEBUG
 
@@ -45,6 +47,16 @@ class TestSetupLogger:
         assert logger.name == "test"
         assert logger.level == logging.DEBUG
 
+    @pytest.mark.parametrize("level, expected", [
+        ("warn", logging.WARNING),
+        ("FATAL", logging.CRITICAL),
+        ("notset", logging.NOTSET),
+    ])
+    def test_setup_logger_level_aliases(self, level, expected):
+        """Test the alias level names logging itself defines still resolve."""
+        logger = setup_logger(f"unique_test_logger_alias_{level}", level)
+        assert logger.level == expected
+
     def test_setup_logger_invalid_level(self):
         """Test setup_logger with invalid level defaults to INFO."""
         with pytest.raises(AttributeError):
@@ -54,7 +66,7 @@ class TestSetupLogger:
     def test_setup_logger_creates_log_directory(self, mock_mkdir):
         """Test that setup_logger creates the log directory."""
         with patch('logging.handlers.RotatingFileHandler'):
-            setup_logger()
+            setup_logger("unique_test_logger_mkdir")
 
             # Verify directory creation was called
             mock_mkdir.assert_called_once_with(parents=True, exist_ok=True)
@@ -77,7 +89,7 @@ class TestSetupLogger:
 
                 logger = setup_logger("unique_test_logger_3")
 
-                file_handler = logger.handlers[1]
+                file_handler = logger.handlers[1].file_handler
                 assert isinstance(file_handler, logging.handlers.RotatingFileHandler)
 
                 # Check maxBytes and backupCount
@@ -89,7 +101,7 @@ class TestSetupLogger:
         logger = setup_logger()
 
         console_handler = logger.handlers[0]
-        file_handler = logger.handlers[1]
+        file_handler = logger.handlers[1].file_handler
 
         # Check console formatter
         console_formatter = console_handler.formatter
@@ -107,6 +119,20 @@ class TestSetupLogger:
         assert "%(lineno)d" in file_formatter._fmt
         assert "%(message)s" in file_formatter._fmt
 
+    def test_setup_logger_formatter_output(self):
+        """Test the precompiled formats render records like plain Formatters."""
+        logger = setup_logger()
+        formatter = logger.handlers[1].file_handler.formatter
+        record = logging.LogRecord(
+            "kiotviet", logging.INFO, "job.py", 12, "synced %d rows", (3,), None
+        )
+
+        expected = logging.Formatter(formatter._fmt).format(record)
+
+        assert formatter.usesTime() is True
+        assert formatter.format(record) == expected
+        assert "job.py:12 - synced 3 rows" in expected
+
     def test_setup_logger_returns_same_instance(self):
         """Test that setup_logger returns the same logger instance for same name."""
         logger1 = setup_logger("test_logger")
@@ -114,9 +140,109 @@ class TestSetupLogger:
 
         assert logger1 is logger2
 
+    def test_setup_logger_attaches_handlers_once(self):
+        """Test repeated calls for one name do not duplicate handlers."""
+        logger = setup_logger("unique_test_logger_repeat")
+        setup_logger("unique_test_logger_repeat")
+
+        assert len(logger.handlers) == 2
+        assert logger.propagate is False
+
+    def test_setup_logger_repeat_call_updates_level(self):
+        """Test a repeated call still applies the requested level."""
+        setup_logger("unique_test_logger_relevel")
+        logger = setup_logger("unique_test_logger_relevel", "DEBUG")
+
+        assert logger.level == logging.DEBUG
+
     def test_setup_logger_different_instances(self):
         """Test that setup_logger returns different instances for different names."""
         logger1 = setup_logger("logger1")
         logger2 = setup_logger("logger2")
 
-        assert logger1 is not logger2
\ No newline at end of file
+        assert logger1 is not logger2
+
+class TestSharedLogger:
+    """Test the lazily built module-level logger."""
+
+    def test_logger_is_configured_once(self):
+        """Test repeated access does not add handlers again."""
+        import src.utils.logger as logger_module
+
+        first = logger_module.logger
+        handlers = len(first.handlers)
+
+        assert logger_module.logger is first
+        assert len(first.handlers) == handlers
+        assert first.name == "kiotviet"
+
+
+class TestFileQueueHandler:
+    """Test that file writes go through the shared listener thread."""
+
+    def test_records_reach_the_file(self, tmp_path):
+        """Test a queued record is written with merged arguments."""
+        import src.utils.logger as logger_module
+
+        file_handler = logging.FileHandler(tmp_path / "queued.log")
+        file_handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        queue_handler = logger_module.FileQueueHandler(file_handler)
+        logger = logging.getLogger("queued_test_logger")
+        logger.propagate = False
+        logger.addHandler(queue_handler)
+        try:
+            logger.warning("hello %s", "world")
+            # stop() drains the queue; restart so later tests keep a listener
+            logger_module._listener.stop()
+            logger_module._listener.start()
+        finally:
+            logger.removeHandler(queue_handler)
+            file_handler.close()
+
+        assert (tmp_path / "queued.log").read_text() == "WARNING hello world\n"
+
+    def test_listener_is_shared(self):
+        """Test every logger uses one listener thread."""
+        import src.utils.logger as logger_module
+
+        setup_logger("shared_listener_1")
+        listener = logger_module._listener
+        setup_logger("shared_listener_2")
+
+        assert logger_module._listener is listener
+
+
+class TestSizeTrackingRotatingFileHandler:
+    """Test rollover decided from the counted file size."""
+
+    def _record(self, message):
+        return logging.LogRecord("kiotviet", logging.INFO, __file__, 1, message, None, None)
+
+    def test_rolls_over_at_max_bytes(self, tmp_path):
+        """Test files rotate once the written bytes reach maxBytes."""
+        log_file = tmp_path / "app.log"
+        handler = SizeTrackingRotatingFileHandler(log_file, maxBytes=21, backupCount=2)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            for message in ("a" * 9, "b" * 9, "c" * 9):
+                handler.handle(self._record(message))
+        finally:
+            handler.close()
+
+        assert (tmp_path / "app.log.1").read_text() == "a" * 9 + "\n" + "b" * 9 + "\n"
+        assert log_file.read_text() == "c" * 9 + "\n"
+
+    def test_counts_existing_file_and_encoded_bytes(self, tmp_path):
+        """Test the counter starts from the file size and counts bytes, not characters."""
+        log_file = tmp_path / "app.log"
+        log_file.write_bytes(b"x" * 10)
+        handler = SizeTrackingRotatingFileHandler(
+            log_file, maxBytes=30, backupCount=1, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        try:
+            assert handler._size == 10
+            assert handler.shouldRollover(self._record("đồng")) is False
+            assert handler._size == 10 + len("đồng\n".encode("utf-8"))
+        finally:
+            handler.close()
@@ -0,0 +1,75 @@
+"""Tests for the product CSV export."""
+
+import shutil
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.api.exceptions import KiotVietAPIError
+from src.services.product_service import ProductService
+
+
+@pytest.fixture
+def service():
+    service = ProductService.__new__(ProductService)
+    service._logger = MagicMock()
+    return service
+
+
+class TestWriteCsv:
+    """Test streaming product pages into the export file."""
+
+    def test_pages_are_written_in_order(self, service, temp_data_dir):
+        """Test every page is written and the product count is returned."""
+        output = temp_data_dir / "products.csv"
+        pages = iter([[{"Id": 1, "Name": "A"}], [{"Id": 2}]])
+
+        assert service._write_csv(pages, output, ("Id", "Name")) == 2
+        assert output.read_text(encoding="utf-8-sig").splitlines() == [
+            "Id,Name",
+            "1,A",
+            "2,",
+        ]
+
+    def test_failed_fetch_keeps_previous_export(self, service, temp_data_dir):
+        """Test an API error mid-export leaves the old file untouched."""
+        output = temp_data_dir / "products.csv"
+        output.write_text("previous", encoding="utf-8")
+
+        def pages():
+            yield [{"Id": 1}]
+            raise KiotVietAPIError("boom")
+
+        with pytest.raises(KiotVietAPIError):
+            service._write_csv(pages(), output, ("Id",))
+
+        assert output.read_text(encoding="utf-8") == "previous"
+        assert list(temp_data_dir.iterdir()) == [output]
+
+    def test_no_products_writes_nothing(self, service, temp_data_dir):
+        """Test an empty catalog does not create a file."""
+        output = temp_data_dir / "products.csv"
+
+        assert service._write_csv(iter([]), output, ("Id",)) == 0
+        assert not output.exists()
+
+
+class TestExport:
+    """Test the export entry point."""
+
+    def test_directory_removed_between_runs_is_recreated(self, service, temp_data_dir):
+        """Test a long-lived service recreates an output directory deleted mid-run."""
+        output_dir = temp_data_dir / "output"
+        service.output_path = output_dir / "products.csv"
+        service.page_size = 100
+        service.get_credentials_and_headers = MagicMock(
+            return_value=(MagicMock(branch_id=1), {})
+        )
+        service._iter_product_pages = MagicMock(side_effect=lambda *_: iter([[{"Id": 1}]]))
+
+        service.export(fields=("Id",))
+        shutil.rmtree(output_dir)
+        result = service.export(fields=("Id",))
+
+        assert result.products == 1
+        assert service.output_path.read_text(encoding="utf-8-sig").splitlines() == ["Id", "1"]
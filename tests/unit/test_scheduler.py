@@ -0,0 +1,37 @@
+"""Tests for the APScheduler entry point."""
+
+import pytest
+
+pytest.importorskip("apscheduler")
+
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+
+from python_scheduler import build_trigger
+from src.api.exceptions import ConfigurationError
+
+
+class TestBuildTrigger:
+    """Test trigger selection and interval validation."""
+
+    def test_no_hours_uses_interval_trigger(self):
+        """Test an empty hour window runs at a fixed cadence around the clock."""
+        trigger = build_trigger(90, "")
+        assert isinstance(trigger, IntervalTrigger)
+
+    def test_hours_use_cron_trigger(self):
+        """Test an hour window builds a cron trigger."""
+        assert isinstance(build_trigger(2, "8-23"), CronTrigger)
+
+    @pytest.mark.parametrize("interval", [60, 90])
+    def test_hour_window_rejects_hourly_or_longer(self, interval):
+        """Test intervals a minute step cannot express are rejected."""
+        with pytest.raises(ConfigurationError, match="below 60"):
+            build_trigger(interval, "8-23")
+
+    @pytest.mark.parametrize("hours", ["", "8-23"])
+    @pytest.mark.parametrize("interval", [0, -5])
+    def test_non_positive_interval_is_rejected(self, interval, hours):
+        """Test zero or negative intervals are rejected in both modes."""
+        with pytest.raises(ConfigurationError, match="at least 1"):
+            build_trigger(interval, hours)
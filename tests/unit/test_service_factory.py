@@ -0,0 +1,58 @@
+"""Tests for the cached service accessors."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.services import BaseService, _factory
+from src.services import get_invoice_service, get_product_service, reset
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    reset()
+    yield
+    reset()
+
+
+class TestServiceFactory:
+    """Test get_invoice_service / get_product_service."""
+
+    def test_invoice_service_is_built_once(self):
+        """Test repeated calls return the same InvoiceService."""
+        with patch.object(_factory, "InvoiceService") as mock_cls:
+            first = get_invoice_service()
+            second = get_invoice_service()
+
+        assert first is second
+        mock_cls.assert_called_once_with()
+
+    def test_product_service_is_built_once(self):
+        """Test repeated calls return the same ProductService."""
+        with patch.object(_factory, "ProductService") as mock_cls:
+            first = get_product_service()
+            second = get_product_service()
+
+        assert first is second
+        mock_cls.assert_called_once_with()
+
+    def test_reset_rebuilds_services(self):
+        """Test reset() forces new instances on the next call."""
+        with patch.object(_factory, "InvoiceService") as mock_cls:
+            mock_cls.side_effect = [object(), object()]
+            first = get_invoice_service()
+            reset()
+            second = get_invoice_service()
+
+        assert first is not second
+        assert mock_cls.call_count == 2
+
+    def test_services_share_one_client(self):
+        """Test services built without a client reuse the same connection pool."""
+        assert BaseService().client is BaseService().client
+
+    def test_reset_drops_shared_client(self):
+        """Test reset() also rebuilds the shared client."""
+        first = BaseService().client
+        reset()
+        assert BaseService().client is not first
@@ -0,0 +1,58 @@
+"""Tests for token storage."""
+
+import json
+import os
+
+import pytest
+
+from src.api.exceptions import ConfigurationError
+from src.models.credentials import AccessCredentials
+from src.services.token_service import TokenService
+
+
+class TestTokenCache:
+    """Test that the token file is only re-parsed when it changes."""
+
+    def test_unchanged_file_is_parsed_once(self, temp_data_dir, sample_token):
+        """Test repeated loads reuse the parsed credentials and headers."""
+        token_file = temp_data_dir / "token.json"
+        token_file.write_text(json.dumps(sample_token), encoding="utf-8")
+        service = TokenService(token_file)
+
+        first = service.load_with_headers()
+        second = service.load_with_headers()
+
+        assert first[0] is second[0]
+        assert first[1] is second[1]
+        assert first[1]["Authorization"] == "Bearer test_token_123"
+
+    def test_rewritten_file_is_reloaded(self, temp_data_dir, sample_token):
+        """Test a changed mtime invalidates the cache."""
+        token_file = temp_data_dir / "token.json"
+        token_file.write_text(json.dumps(sample_token), encoding="utf-8")
+        service = TokenService(token_file)
+        service.load()
+
+        token_file.write_text(
+            json.dumps({**sample_token, "access_token": "rotated"}), encoding="utf-8"
+        )
+        stat = token_file.stat()
+        os.utime(token_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert service.load().access_token == "rotated"
+
+    def test_save_invalidates_cache(self, temp_data_dir, sample_token):
+        """Test credentials saved through the service are seen by the next load."""
+        token_file = temp_data_dir / "token.json"
+        token_file.write_text(json.dumps(sample_token), encoding="utf-8")
+        service = TokenService(token_file)
+        service.load()
+
+        service.save(AccessCredentials(access_token="saved", retailer_id="r", branch_id=2))
+
+        assert service.load().access_token == "saved"
+
+    def test_missing_file_raises(self, temp_data_dir):
+        """Test a missing token file is a configuration error."""
+        with pytest.raises(ConfigurationError, match="Token file not found"):
+            TokenService(temp_data_dir / "missing.json").load()